@@ -8,6 +8,7 @@ Endpoints:
 
 import json
 import sys
+import time
 from pathlib import Path
 from flask import Flask, request, jsonify
 from flask_cors import CORS
@@ -69,6 +70,7 @@ def analyze():
     }
 
     results = []
+    now = time.time()  # one reference time for every cookie in the request
 
     for cookie in cookies:
         # 1. Extract features
@@ -85,7 +87,7 @@ def analyze():
 
         # 3. Risk scoring
         risk_result = scorer.analyze_cookie(
-            cookie, cookie_type, confidence, probabilities, site_host=site_domain
+            cookie, cookie_type, confidence, probabilities, site_host=site_domain, now=now
         )
 
         # 4. Explainability (NEW in 2.0)
@@ -4,9 +4,11 @@ Trains and evaluates: RandomForest, LogisticRegression, HistGradientBoosting
 Selects best model by Recall@FPR constraint + PR-AUC, saves model card.
 """
 
+import os
 import pickle
 import json
 import numpy as np
+from joblib import Parallel, delayed
 from typing import Dict, Tuple, Optional, List
 from datetime import datetime
 
@@ -68,57 +70,20 @@ class CookieClassifier:
             ),
         }
 
-        results = []
-
-        for name, clf in candidates.items():
-            print(f"\n  Training {name}...")
-            clf.fit(X_train_scaled, y_train)
-
-            # Get probabilities
-            probs_val = clf.predict_proba(X_val_scaled)
-            preds_val = clf.predict(X_val_scaled)
-
-            # Overall accuracy and F1
-            acc = accuracy_score(y_val, preds_val)
-            f1_macro = f1_score(y_val, preds_val, average='macro', zero_division=0)
-
-            # Auth-specific: binary (auth=1 vs rest)
-            y_val_auth = (y_val == 1).astype(int)
-            probs_auth = probs_val[:, 1] if probs_val.shape[1] > 1 else probs_val[:, 0]
-
-            # PR-AUC for auth class
-            precision_arr, recall_arr, _ = precision_recall_curve(y_val_auth, probs_auth)
-            pr_auc = auc(recall_arr, precision_arr)
-
-            # Recall @ FPR ≤ alpha
-            fpr, tpr, thresholds = roc_curve(y_val_auth, probs_auth)
-            valid = fpr <= alpha
-            recall_at_alpha = tpr[valid].max() if valid.any() else 0.0
+        # The three fits are independent, so run them side by side when cores allow
+        n_jobs = min(len(candidates), os.cpu_count() or 1)
+        if n_jobs > 1:
+            # Models already train concurrently; keep the forest from fanning out on top of that
+            candidates['RandomForest'].set_params(n_jobs=1)
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(_fit_and_score)(name, clf, X_train_scaled, y_train, X_val_scaled, y_val, feature_names, alpha)
+            for name, clf in candidates.items()
+        )
 
-            # Feature importance
-            if hasattr(clf, 'feature_importances_'):
-                importance = dict(zip(feature_names, clf.feature_importances_))
-            elif hasattr(clf, 'coef_'):
-                # For LR: use mean absolute coefficient across classes
-                mean_abs = np.abs(clf.coef_).mean(axis=0)
-                importance = dict(zip(feature_names, mean_abs / mean_abs.sum()))
-            else:
-                importance = {}
-
-            results.append({
-                'name': name,
-                'model': clf,
-                'accuracy': acc,
-                'f1_macro': f1_macro,
-                'pr_auc_auth': pr_auc,
-                'recall_at_alpha': recall_at_alpha,
-                'alpha': alpha,
-                'feature_importance': importance,
-                'probs_val': probs_val,
-            })
-
-            print(f"    Accuracy: {acc:.2%} | F1(macro): {f1_macro:.3f} | "
-                  f"PR-AUC(auth): {pr_auc:.3f} | Recall@FPR≤{alpha}: {recall_at_alpha:.3f}")
+        for r in results:
+            print(f"\n  Training {r['name']}...")
+            print(f"    Accuracy: {r['accuracy']:.2%} | F1(macro): {r['f1_macro']:.3f} | "
+                  f"PR-AUC(auth): {r['pr_auc_auth']:.3f} | Recall@FPR≤{alpha}: {r['recall_at_alpha']:.3f}")
 
         # Sort by: recall_at_alpha (primary), then pr_auc_auth (secondary)
         results.sort(key=lambda r: (r['recall_at_alpha'], r['pr_auc_auth']), reverse=True)
@@ -217,6 +182,27 @@ class CookieClassifier:
         label = self.LABELS[pred]
         return label, float(probs[pred]), {self.LABELS[i]: float(p) for i, p in enumerate(probs)}
 
+    def predict_from_matrix(self, X, cookies=None):
+        """
+        Batch form of predict_from_dict over rows in self.feature_names column order.
+
+        Rule matches are resolved per cookie first; the remaining rows share one
+        scaler/model/calibration pass.
+
+        Returns:
+            List of (label, confidence, probabilities) tuples, one per row.
+        """
+        results = [self._apply_rules(c) if c else None for c in cookies] if cookies is not None else [None] * len(X)
+        rows = [i for i, r in enumerate(results) if r is None]
+        if rows:
+            # Training and predict_from_dict both run in float64 (model card train_dtype)
+            preds, probs = self.predict(np.asarray(X, dtype=np.float64)[rows])
+            # predict() unwraps single-row input; restore the batch shape
+            preds, probs = np.atleast_1d(preds), np.atleast_2d(probs)
+            for i, pred, p in zip(rows, preds, probs):
+                results[i] = (self.LABELS[pred], float(p[pred]), {self.LABELS[j]: float(v) for j, v in enumerate(p)})
+        return results
+
     def _apply_rules(self, cookie):
         name = cookie.get('name', '').lower()
         if name.startswith('__host-') and any(k in name for k in ['session', 'auth', 'token']):
@@ -329,3 +315,51 @@ class CookieClassifier:
             'has_lr_explainability': self.lr_coefficients is not None,
             'metrics': metrics or {},
         }
+
+
+def _fit_and_score(name, clf, X_train, y_train, X_val, y_val, feature_names, alpha):
+    """Fit one benchmark candidate on scaled data and score it on the validation split."""
+    clf.fit(X_train, y_train)
+
+    # Get probabilities
+    probs_val = clf.predict_proba(X_val)
+    preds_val = clf.predict(X_val)
+
+    # Overall accuracy and F1
+    acc = accuracy_score(y_val, preds_val)
+    f1_macro = f1_score(y_val, preds_val, average='macro', zero_division=0)
+
+    # Auth-specific: binary (auth=1 vs rest)
+    y_val_auth = (y_val == 1).astype(int)
+    probs_auth = probs_val[:, 1] if probs_val.shape[1] > 1 else probs_val[:, 0]
+
+    # PR-AUC for auth class
+    precision_arr, recall_arr, _ = precision_recall_curve(y_val_auth, probs_auth)
+    pr_auc = auc(recall_arr, precision_arr)
+
+    # Recall @ FPR ≤ alpha
+    fpr, tpr, thresholds = roc_curve(y_val_auth, probs_auth)
+    valid = fpr <= alpha
+    recall_at_alpha = tpr[valid].max() if valid.any() else 0.0
+
+    # Feature importance
+    if hasattr(clf, 'feature_importances_'):
+        importance = dict(zip(feature_names, clf.feature_importances_))
+    elif hasattr(clf, 'coef_'):
+        # For LR: use mean absolute coefficient across classes
+        mean_abs = np.abs(clf.coef_).mean(axis=0)
+        importance = dict(zip(feature_names, mean_abs / mean_abs.sum()))
+    else:
+        importance = {}
+
+    return {
+        'name': name,
+        'model': clf,
+        'accuracy': acc,
+        'f1_macro': f1_macro,
+        'pr_auc_auth': pr_auc,
+        'recall_at_alpha': recall_at_alpha,
+        'alpha': alpha,
+        'feature_importance': importance,
+        'probs_val': probs_val,
+    }
@@ -40,10 +40,8 @@ LABEL_MAP = {name: i for i, name in enumerate(LABELS)}
 
 def load_or_generate_data(data_dir, n_samples=5000):
     """Generate a larger dataset for robust evaluation."""
-    generator = TrainingDataGenerator()
     # Use a fixed seed for reproducibility
-    import random
-    random.seed(42)
+    generator = TrainingDataGenerator(seed=42)
     dataset = generator.generate_dataset(n_samples=n_samples)
     return dataset
 
@@ -54,7 +52,7 @@ def extract_features(dataset, extractor):
     X, y, site_ids, cookie_names, domains = [], [], [], [], []
 
     for cookie in dataset:
-        features = extractor.extract_features(cookie)
+        features = extractor.extract_features(cookie, include_meta=False)
         X.append([features[n] for n in feature_names])
         y.append(LABEL_MAP[cookie['label']])
         site_ids.append(cookie.get('site_id', 'unknown'))
@@ -4,6 +4,8 @@ Generates human-readable explanations for why the AI flagged each cookie.
 Two paths: rule-based top signals + LR coefficient-based contributions.
 """
 
+import re
+from bisect import bisect_right
 from typing import Dict, List, Tuple
 
 
@@ -11,36 +13,82 @@ from typing import Dict, List, Tuple
 # Feature → human-readable explanation mapping
 # ─────────────────────────────────────────────────────────────
 
-AUTH_SIGNAL_MAP = {
-    'name_matches_auth':        ('Identity keyword in name', 'Cookie name matches authentication patterns (session, auth, token, etc.)'),
-    'f_changed_during_login':   ('Changed during login', 'Cookie value changed when user logged in — strong authentication signal'),
-    'f_new_after_login':        ('Appeared after login', 'Cookie was created during the login process'),
-    'f_rotated_after_login':    ('Rotated after login', 'Cookie value was rotated at login — typical of session tokens'),
-    'has_httponly':              ('HttpOnly flag set', 'Server restricted JavaScript access — common for auth cookies'),
-    'has_secure':               ('Secure flag set', 'Cookie requires HTTPS — standard for sensitive tokens'),
-    'is_session_cookie':        ('Session-scoped', 'Cookie expires when browser closes — typical for session tokens'),
-    'value_looks_like_jwt':     ('JWT token pattern', 'Value matches JSON Web Token structure (header.payload.signature)'),
-    'value_entropy_bucket':     ('High-entropy token', 'Cookie value has high randomness — characteristic of cryptographic tokens'),
-    'value_looks_like_hex':     ('Hex token value', 'Value is hexadecimal — common for session identifiers'),
-    'value_length_bucket':      ('Long token value', 'Cookie value length suggests a security token'),
-    'has_host_prefix':          ('__Host- prefix', 'Uses secure __Host- prefix — locked to specific origin'),
-    'has_secure_prefix':        ('__Secure- prefix', 'Uses __Secure- prefix — requires HTTPS'),
-    'f_login_behavior_score':   ('Strong login correlation', 'Multiple login-related behavior signals detected'),
+AUTH_SIGNALS = (
+    ('name_matches_auth',        'Identity keyword in name', 'Cookie name matches authentication patterns (session, auth, token, etc.)'),
+    ('f_changed_during_login',   'Changed during login', 'Cookie value changed when user logged in — strong authentication signal'),
+    ('f_new_after_login',        'Appeared after login', 'Cookie was created during the login process'),
+    ('f_rotated_after_login',    'Rotated after login', 'Cookie value was rotated at login — typical of session tokens'),
+    ('has_httponly',             'HttpOnly flag set', 'Server restricted JavaScript access — common for auth cookies'),
+    ('has_secure',               'Secure flag set', 'Cookie requires HTTPS — standard for sensitive tokens'),
+    ('is_session_cookie',        'Session-scoped', 'Cookie expires when browser closes — typical for session tokens'),
+    ('value_looks_like_jwt',     'JWT token pattern', 'Value matches JSON Web Token structure (header.payload.signature)'),
+    ('value_entropy_bucket',     'High-entropy token', 'Cookie value has high randomness — characteristic of cryptographic tokens'),
+    ('value_looks_like_hex',     'Hex token value', 'Value is hexadecimal — common for session identifiers'),
+    ('value_length_bucket',      'Long token value', 'Cookie value length suggests a security token'),
+    ('has_host_prefix',          '__Host- prefix', 'Uses secure __Host- prefix — locked to specific origin'),
+    ('has_secure_prefix',        '__Secure- prefix', 'Uses __Secure- prefix — requires HTTPS'),
+    ('f_login_behavior_score',   'Strong login correlation', 'Multiple login-related behavior signals detected'),
+)
+
+RISK_SIGNALS = (
+    ('cross_site_sendable',      'Sent cross-site (SameSite=None)', 'Cookie is sent with cross-origin requests, enabling CSRF attacks'),
+    ('domain_is_wildcard',       'Shared across subdomains', 'Wildcard domain scope — any subdomain can access this cookie'),
+    ('f_subdomain_shared',       'Subdomain-shared scope', 'Cookie accessible to multiple subdomains — broader attack surface'),
+    ('f_third_party_context',    'Third-party context', 'Cookie set by or shared with a different domain'),
+    ('exposure_score',           'High exposure score', 'Combined domain scope and lifetime create elevated exposure'),
+    ('f_persistent_days_bucket', 'Long-lived cookie', 'Extended lifetime increases window for replay attacks'),
+)
+
+TRACKING_SIGNALS = (
+    ('name_matches_tracking',    'Tracking keyword in name', 'Name matches known analytics/tracking patterns (_ga, fbp, etc.)'),
+    ('f_third_party_context',    'Third-party tracker', 'Cookie is set by an external domain — typical of ad/analytics trackers'),
+)
+
+# Keyed view of AUTH_SIGNALS for looking up model-driven features by name
+AUTH_SIGNAL_MAP = {feat: (short, detail) for feat, short, detail in AUTH_SIGNALS}
+
+# Signals kept per explanation. Tuple order above is priority order, so the
+# loops below stop as soon as a cap is reached.
+MAX_AUTH_SIGNALS = 5
+MAX_RISK_SIGNALS = 3
+MAX_TRACKING_SIGNALS = 3
+
+# Issue-title keyword → severity points (mirrors risk_scorer.py)
+SEVERITY_POINT_MAP = {
+    'httponly': 40,
+    'secure flag': 25,
+    'samesite': 20,
+    'wildcard domain': 15,
+    'long-lived': 10,
+    'moderate session': 5,
+    'multi-day': 3,
+    'broad path': 5,
+    'non-host-only': 6,
+    'shared cookie': 4,
 }
 
-RISK_SIGNAL_MAP = {
-    'cross_site_sendable':      ('Sent cross-site (SameSite=None)', 'Cookie is sent with cross-origin requests, enabling CSRF attacks'),
-    'domain_is_wildcard':       ('Shared across subdomains', 'Wildcard domain scope — any subdomain can access this cookie'),
-    'f_subdomain_shared':       ('Subdomain-shared scope', 'Cookie accessible to multiple subdomains — broader attack surface'),
-    'f_third_party_context':    ('Third-party context', 'Cookie set by or shared with a different domain'),
-    'exposure_score':           ('High exposure score', 'Combined domain scope and lifetime create elevated exposure'),
-    'f_persistent_days_bucket': ('Long-lived cookie', 'Extended lifetime increases window for replay attacks'),
-}
+# One alternation over all keywords: a single scan per issue title
+_SEV_RE = re.compile('|'.join(re.escape(k) for k in SEVERITY_POINT_MAP))
+
+_RISK_FORMULA_STR = 'RiskScore = Σ(Severity Points) × Breadth × Lifetime  [gated on P(auth) > 0.3]'
 
-TRACKING_SIGNAL_MAP = {
-    'name_matches_tracking':    ('Tracking keyword in name', 'Name matches known analytics/tracking patterns (_ga, fbp, etc.)'),
-    'f_third_party_context':    ('Third-party tracker', 'Cookie is set by an external domain — typical of ad/analytics trackers'),
-}
+
+# Interpretation lookup: [auth bucket][estimated-score bucket]
+#   auth bucket:  0 = P(auth) ≤ 0.3, 1 = ≤ 0.7, 2 = > 0.7
+#   score bucket: 0 = 0, 1 = 1-14, 2 = 15-29, 3 = 30-49, 4 = ≥ 50
+_SCORE_BUCKETS = (1, 15, 30, 50)
+_LOW_AUTH = "Low authentication probability — severity checks not applied"
+_POSSIBLE_MODERATE = "Possible auth cookie with moderate risk"
+_POSSIBLE_ELEVATED = "Possible auth cookie with elevated risk from missing protections"
+_AUTH_GOOD = "Auth cookie with good security posture — low risk"
+_INTERPRETATION_TABLE = (
+    (_LOW_AUTH,) * 5,
+    ("Minimal security concerns detected", _POSSIBLE_MODERATE, _POSSIBLE_MODERATE,
+     _POSSIBLE_ELEVATED, _POSSIBLE_ELEVATED),
+    (_AUTH_GOOD, _AUTH_GOOD, _POSSIBLE_MODERATE,
+     "High-confidence auth cookie with significant security gaps",
+     "High-confidence auth cookie with critical security gaps — account takeover possible"),
+)
 
 
 def explain_prediction(
@@ -70,10 +118,15 @@ def explain_prediction(
     risk_signals = []
     tracking_signals = []
 
+    # Bind hot lookups once as locals
+    features_get = features.get
+    auth_prob = classification_probs.get('authentication', 0)
+    tracking_prob = classification_probs.get('tracking', 0)
+
     # ── Auth classification signals ──────────────────────────
-    if classification_type == 'authentication' or classification_probs.get('authentication', 0) > 0.3:
-        for feat_name, (short, detail) in AUTH_SIGNAL_MAP.items():
-            val = features.get(feat_name, 0)
+    if classification_type == 'authentication' or auth_prob > 0.3:
+        for feat_name, short, detail in AUTH_SIGNALS:
+            val = features_get(feat_name, 0)
             if _is_active(feat_name, val):
                 auth_signals.append({
                     'signal': short,
@@ -82,9 +135,12 @@ def explain_prediction(
                     'value': val,
                     'direction': 'positive',  # increases P(auth)
                 })
+                if len(auth_signals) >= MAX_AUTH_SIGNALS:
+                    break
 
         # Add model-based contributions if available
-        if model_contributions and model_contributions.get('auth_drivers'):
+        if (model_contributions and model_contributions.get('auth_drivers')
+                and len(auth_signals) < MAX_AUTH_SIGNALS):
             for fname, contrib, fval in model_contributions['auth_drivers']:
                 # Avoid duplicating signals already captured
                 if not any(s['feature'] == fname for s in auth_signals):
@@ -102,10 +158,12 @@ def explain_prediction(
                             'direction': 'positive',
                             'coefficient_contribution': contrib,
                         })
+                        if len(auth_signals) >= MAX_AUTH_SIGNALS:
+                            break
 
     # ── Risk / exposure signals ──────────────────────────────
-    for feat_name, (short, detail) in RISK_SIGNAL_MAP.items():
-        val = features.get(feat_name, 0)
+    for feat_name, short, detail in RISK_SIGNALS:
+        val = features_get(feat_name, 0)
         if _is_active(feat_name, val):
             risk_signals.append({
                 'signal': short,
@@ -113,11 +171,13 @@ def explain_prediction(
                 'feature': feat_name,
                 'value': val,
             })
+            if len(risk_signals) >= MAX_RISK_SIGNALS:
+                break
 
     # ── Tracking signals ─────────────────────────────────────
-    if classification_type == 'tracking' or classification_probs.get('tracking', 0) > 0.3:
-        for feat_name, (short, detail) in TRACKING_SIGNAL_MAP.items():
-            val = features.get(feat_name, 0)
+    if classification_type == 'tracking' or tracking_prob > 0.3:
+        for feat_name, short, detail in TRACKING_SIGNALS:
+            val = features_get(feat_name, 0)
             if _is_active(feat_name, val):
                 tracking_signals.append({
                     'signal': short,
@@ -125,39 +185,25 @@ def explain_prediction(
                     'feature': feat_name,
                     'value': val,
                 })
+                if len(tracking_signals) >= MAX_TRACKING_SIGNALS:
+                    break
 
     # ── Risk formula breakdown ───────────────────────────────
-    auth_prob = classification_probs.get('authentication', 0)
-    exposure = features.get('exposure_score', 1.0)
-
     # Reconstruct severity points from issue list (mirrors risk_scorer.py)
-    severity_point_map = {
-        'httponly': 40,
-        'secure flag': 25,
-        'samesite': 20,
-        'wildcard domain': 15,
-        'long-lived': 10,
-        'moderate session': 5,
-        'multi-day': 3,
-        'broad path': 5,
-        'non-host-only': 6,
-        'shared cookie': 4,
-    }
     severity_points = 0
     for issue in risk_issues:
         title_lower = (issue.get('title', '') or '').lower()
-        for pattern, pts in severity_point_map.items():
-            if pattern in title_lower:
-                severity_points += pts
-                break
+        m = _SEV_RE.search(title_lower)
+        if m:
+            severity_points += SEVERITY_POINT_MAP[m.group(0)]
 
     # Breadth factor (from domain scope)
-    domain_wildcard = features.get('domain_is_wildcard', 0)
+    domain_wildcard = features_get('domain_is_wildcard', 0)
     breadth = 1.5 if domain_wildcard else 1.0
 
     # Lifetime factor
-    expiry_days = features.get('expiry_days', 0)
-    is_session = features.get('is_session_cookie', 0)
+    expiry_days = features_get('expiry_days', 0)
+    is_session = features_get('is_session_cookie', 0)
     lifetime = 1.0 if is_session else (1.0 + min(expiry_days / 365.0, 1.0))
 
     risk_formula = {
@@ -168,14 +214,14 @@ def explain_prediction(
             'lifetime_factor': round(lifetime, 2),
             'estimated_score': int(severity_points * breadth * lifetime) if auth_prob > 0.3 else 0,
         },
-        'formula': 'RiskScore = Σ(Severity Points) × Breadth × Lifetime  [gated on P(auth) > 0.3]',
+        'formula': _RISK_FORMULA_STR,
         'interpretation': _interpret_risk(auth_prob, severity_points, breadth * lifetime),
     }
 
     return {
-        'auth_signals': auth_signals[:5],    # Top 5
-        'risk_signals': risk_signals[:3],     # Top 3
-        'tracking_signals': tracking_signals[:3],
+        'auth_signals': auth_signals,
+        'risk_signals': risk_signals,
+        'tracking_signals': tracking_signals,
         'risk_formula': risk_formula,
     }
 
@@ -202,17 +248,8 @@ def _is_active(feat_name: str, value) -> bool:
 
 
 def _interpret_risk(auth_prob: float, severity_points: int, exposure_multiplier: float) -> str:
-    estimated = int(severity_points * exposure_multiplier) if auth_prob > 0.3 else 0
-    if auth_prob > 0.7 and estimated >= 50:
-        return "High-confidence auth cookie with critical security gaps — account takeover possible"
-    if auth_prob > 0.7 and estimated >= 30:
-        return "High-confidence auth cookie with significant security gaps"
-    if auth_prob > 0.7 and estimated < 15:
-        return "Auth cookie with good security posture — low risk"
-    if auth_prob > 0.3 and estimated >= 30:
-        return "Possible auth cookie with elevated risk from missing protections"
-    if auth_prob > 0.3 and estimated > 0:
-        return "Possible auth cookie with moderate risk"
     if auth_prob <= 0.3:
-        return "Low authentication probability — severity checks not applied"
-    return "Minimal security concerns detected"
\ No newline at end of file
+        return _INTERPRETATION_TABLE[0][0]
+    estimated = int(severity_points * exposure_multiplier)
+    auth_bucket = 2 if auth_prob > 0.7 else 1
+    return _INTERPRETATION_TABLE[auth_bucket][bisect_right(_SCORE_BUCKETS, estimated)]
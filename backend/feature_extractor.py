@@ -3,17 +3,141 @@ CookieGuard AI 2.0 - Enhanced Feature Extractor
 38 features across 4 groups: Attributes, Scope, Lexical, Behavior
 """
 
+import os
 import re
 import math
+import time
+import numpy as np
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the pure-Python path is used instead
+    njit = None
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; falls back to the compiled regexes
+    ahocorasick = None
+
+# Bucket edges (bisect_right: value < edge[0] → 0, < edge[1] → 1, ...)
+_LIFETIME_BUCKETS = (1, 7, 30)
+_VALUE_LEN_BUCKETS = (20, 50, 100)
+_ENTROPY_BUCKETS = (2.0, 4.0)
+# Persistent-days edges are inclusive (≤7d → 1, ≤30d → 2), hence bisect_left
+_PERSIST_BUCKETS = (7, 30)
+_SAMESITE_LEVELS = {'strict': 2, 'lax': 1}
+_SECONDS_PER_DAY = 86400
+# Strings at least this long are histogrammed with collections.Counter
+_COUNTER_MIN_LEN = 32
+# Popcount of a 3-bit flag word: (secure << 2) | (httponly << 1) | samesite_set
+_POSTURE_LUT = (0, 1, 1, 2, 1, 2, 2, 3)
+
+_HEX_RE = re.compile(r'^[a-fA-F0-9]+$')
+_B64_ALPHABET = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=-_')
+_B64_TABLE = np.array([chr(i) in _B64_ALPHABET for i in range(128)], dtype=np.bool_)
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _characterize_ascii(buf, b64_table):
+        """
+        Single pass over an ASCII value's bytes.
+
+        Returns (entropy, is_hex, is_base64, is_numeric, dot_count) with the
+        same semantics as the pure-Python checks in _feature_row.
+        """
+        n = buf.size
+        counts = np.zeros(128, np.int64)
+        # Symbols in order of first appearance, so the entropy terms are
+        # summed in the same order as _entropy's dict/Counter iteration
+        order = np.empty(128, np.int64)
+        distinct = 0
+        non_hex = 0
+        non_digit = 0
+        dots = 0
+        for b in buf:
+            if counts[b] == 0:
+                order[distinct] = b
+                distinct += 1
+            counts[b] += 1
+            if b == 46:
+                dots += 1
+            if b < 48 or b > 57:
+                non_digit += 1
+                if not (65 <= b <= 70 or 97 <= b <= 102):
+                    non_hex += 1
+        entropy = 0.0
+        bad = 0
+        for j in range(distinct):
+            c = order[j]
+            p = counts[c] / n
+            entropy -= p * np.log2(p)
+            if not b64_table[c]:
+                bad += 1
+        # Mirror re.match('^[a-fA-F0-9]+$'): '$' also matches before a final newline
+        is_hex = n > 0 and (non_hex == 0 or (non_hex == 1 and n > 1 and buf[n - 1] == 10))
+        is_base64 = bad < max(distinct * 0.1, 1)
+        return entropy, is_hex, is_base64, n > 0 and non_digit == 0, dots
+
+    # Compile (or load from the on-disk cache) at import, not on the first request
+    _characterize_ascii(np.frombuffer(b'warmup', dtype=np.uint8), _B64_TABLE)
+else:
+    _characterize_ascii = None
+
+
+def _build_name_automaton(categories):
+    """
+    One Aho-Corasick automaton over the unanchored literal patterns of every
+    category. Each literal maps to a bitmask of the categories it belongs to,
+    so a single iter() over a name yields all category hits at once.
+    Returns None when pyahocorasick is not installed.
+    """
+    if ahocorasick is None:
+        return None
+    masks = {}
+    for bit, patterns in categories:
+        for p in patterns:
+            if not p.startswith('^'):
+                masks[p] = masks.get(p, 0) | bit
+    automaton = ahocorasick.Automaton()
+    for literal, mask in masks.items():
+        automaton.add_word(literal, mask)
+    automaton.make_automaton()
+    return automaton
+
+
+def _contains_any(text, literals):
+    """True if any literal occurs in text. A plain loop: cheaper than any() over a generator."""
+    for literal in literals:
+        if literal in text:
+            return True
+    return False
+
 
 class CookieFeatureExtractor:
     AUTH_PATTERNS = [r'session', r'auth', r'token', r'login', r'jwt', r'bearer', r'sid', r'user', r'sso', r'refresh']
     TRACKING_PATTERNS = [r'^_ga', r'^_gid', r'analytics', r'tracking', r'^utm', r'^fbp', r'amplitude', r'mixpanel', r'^_cl']
     PREFERENCE_PATTERNS = [r'lang', r'theme', r'consent', r'preferences', r'settings', r'locale', r'timezone', r'currency']
 
+    # All patterns are lowercase literals (names are lowercased before
+    # matching): anchored ones become a prefix tuple for str.startswith, the
+    # rest plain substring checks - no regex engine involved.
+    _TRACKING_PREFIXES = tuple(p[1:] for p in TRACKING_PATTERNS if p.startswith('^'))
+    _TRACKING_SUBSTRINGS = tuple(p for p in TRACKING_PATTERNS if not p.startswith('^'))
+    _AUTH_SUBSTRINGS = tuple(AUTH_PATTERNS)
+    _PREFERENCE_SUBSTRINGS = tuple(PREFERENCE_PATTERNS)
+
+    # Combined automaton: bit 1 = auth, 2 = tracking (unanchored), 4 = preference
+    _NAME_AUTOMATON = _build_name_automaton(
+        ((1, AUTH_PATTERNS), (2, TRACKING_PATTERNS), (4, PREFERENCE_PATTERNS))
+    )
+
     # Feature groups for explainability
     FEATURE_GROUPS = {
         'attributes': [
@@ -38,94 +162,139 @@ class CookieFeatureExtractor:
         ]
     }
 
-    def extract_features(self, cookie: Dict, context: Dict = None) -> Dict:
+    # Flattened feature order (model column order), built once
+    FEATURE_NAMES = tuple(name for group in FEATURE_GROUPS.values() for name in group)
+
+    # Distinct (name, domain, path, sameSite, secure, httpOnly) keys kept. The
+    # cookie value is deliberately not part of the key: caching on it would
+    # keep users' session tokens alive in memory across requests.
+    STATIC_CACHE_SIZE = 4096
+    # Smallest batch worth fanning out in extract_features_parallel
+    PARALLEL_MIN_COOKIES = 5000
+
+    def __init__(self):
+        # Per-instance cache so entries die with the extractor
+        self._static_features = lru_cache(maxsize=self.STATIC_CACHE_SIZE)(
+            self._compute_static_features
+        )
+
+    def extract_features(self, cookie: Dict, context: Dict = None, include_meta: bool = True) -> Dict:
         """
         Extract all 38 features from a cookie.
         
         Args:
             cookie: Cookie dict with standard fields
             context: Optional dict with loginEvent, changedCookies, beforeCookieIndex, currentDomain
+            include_meta: Add the _cookie_name/_cookie_domain fields; training
+                          code that only reads numeric features passes False
         
         Returns:
-            Feature dict (38 numeric features + 2 metadata fields)
+            Feature dict (38 numeric features, plus 2 metadata fields if include_meta)
+        """
+        features = dict(zip(self.get_feature_names(),
+                            self._feature_row(cookie, context or {}, time.time())))
+
+        if include_meta:
+            # Metadata (not used as model features, but useful for explainability)
+            features['_cookie_name'] = cookie.get('name')
+            features['_cookie_domain'] = cookie.get('domain')
+
+        return features
+
+    def extract_features_matrix(self, cookies: List[Dict], context: Dict = None,
+                                dtype=np.float32) -> np.ndarray:
+        """
+        Extract features for many cookies straight into a model-ready matrix.
+
+        Rows are written in get_feature_names() order without building a
+        per-cookie feature dict, so the result can be fed to the classifier
+        as one contiguous block.
+
+        Args:
+            cookies: List of cookie dicts
+            context: Optional shared context (see extract_features)
+            dtype: Matrix dtype; pass np.float64 to match predict_from_dict exactly
+
+        Returns:
+            Array of shape (len(cookies), 38), float32 unless dtype is given
         """
         context = context or {}
-        features = {}
-        samesite = (cookie.get('sameSite') or '').lower()
+        now = time.time()  # one reference time for the whole batch
+        # Every row is fully overwritten, so skip zero-filling
+        X = np.empty((len(cookies), len(self.get_feature_names())), dtype=dtype)
+        for i, cookie in enumerate(cookies):
+            X[i] = self._feature_row(cookie, context, now)
+        return X
 
-        # ═══════════════════════════════════════════════════════════
-        # GROUP 1: ATTRIBUTES (7 features)
-        # ═══════════════════════════════════════════════════════════
-        features['has_secure'] = int(bool(cookie.get('secure', False)))
-        features['has_httponly'] = int(bool(cookie.get('httpOnly', False)))
-        features['has_samesite'] = int(bool(cookie.get('sameSite')))
-        features['samesite_level'] = 2 if samesite == 'strict' else (1 if samesite == 'lax' else 0)
+    def extract_features_parallel(self, cookies: List[Dict], context: Dict = None,
+                                  workers: int = None) -> np.ndarray:
+        """
+        extract_features_matrix() split across worker processes.
 
-        expiry = cookie.get('expirationDate')
-        if expiry:
-            dt = datetime.fromtimestamp(expiry) if isinstance(expiry, (int, float)) else datetime.fromisoformat(str(expiry))
-            days = max((dt - datetime.now()).days, 0)
-            features['is_session_cookie'] = 0
-            features['expiry_days'] = min(days, 365)
-            features['lifetime_category'] = 0 if days < 1 else (1 if days < 7 else (2 if days < 30 else 3))
-        else:
-            features['is_session_cookie'] = 1
-            features['expiry_days'] = 0
-            features['lifetime_category'] = 0
+        Cookies are cut into one contiguous shard per worker and the shard
+        matrices stacked back in order. Batches below PARALLEL_MIN_COOKIES
+        (or workers=1) run in-process, where pool startup would dominate.
 
-        # ═══════════════════════════════════════════════════════════
-        # GROUP 2: SCOPE (7 features)
-        # ═══════════════════════════════════════════════════════════
-        domain = cookie.get('domain', '')
-        path = cookie.get('path', '/')
-        features['domain_is_wildcard'] = int(domain.startswith('.'))
-        features['domain_depth'] = domain.count('.')
-        features['etld_match'] = 1
-        features['path_is_root'] = int(path == '/')
-        features['path_depth'] = max(path.count('/') - 1, 0)
-        features['cross_site_sendable'] = int(not samesite or samesite in ('none', 'no_restriction'))
-        features['exposure_score'] = (
-            (2.0 if features['domain_is_wildcard'] else 1.0)
-            * (1 + features['expiry_days'] / 365.0)
+        Returns:
+            float32 array of shape (len(cookies), 38)
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(cookies) < self.PARALLEL_MIN_COOKIES:
+            return self.extract_features_matrix(cookies, context)
+        size = -(-len(cookies) // workers)
+        shards = [cookies[i:i + size] for i in range(0, len(cookies), size)]
+        with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+            return np.vstack(list(pool.map(_extract_shard, shards, [context] * len(shards))))
+
+    def _feature_row(self, cookie: Dict, context: Dict, now: float) -> tuple:
+        """
+        Compute all 38 feature values for one cookie, in get_feature_names() order.
+        Expiry features are measured relative to `now` (epoch seconds), supplied by the caller.
+        """
+        # Bind every cookie field once; the rest of the body works on locals
+        get = cookie.get
+        raw_name = get('name', '')
+        value = get('value', '')
+        domain = get('domain', '')
+        path = get('path', '/')
+        raw_samesite = get('sameSite')
+        secure = get('secure', False)
+        httponly = get('httpOnly', False)
+        expiry = get('expirationDate')
+        host_only = get('hostOnly')
+
+        # Attribute/scope/name features that only depend on the cookie's own
+        # metadata come from the cache; the same _ga/_fbp/session cookies
+        # show up on nearly every scan. Value features are never cached.
+        attributes, scope, name_lexical, f_security_posture_score = self._static_features(
+            raw_name, domain, path, raw_samesite or '', bool(secure), bool(httponly)
         )
+        lexical = name_lexical + self._value_features(value)
 
         # ═══════════════════════════════════════════════════════════
-        # GROUP 3: LEXICAL (16 features)
+        # EXPIRY-DEPENDENT (attributes + scope) - relative to now
         # ═══════════════════════════════════════════════════════════
-        name = cookie.get('name', '').lower()
-        value = cookie.get('value', '')
-
-        features['name_matches_auth'] = int(any(re.search(p, name, re.I) for p in self.AUTH_PATTERNS))
-        features['name_matches_tracking'] = int(any(re.search(p, name, re.I) for p in self.TRACKING_PATTERNS))
-        features['name_matches_preference'] = int(any(re.search(p, name, re.I) for p in self.PREFERENCE_PATTERNS))
-        features['has_host_prefix'] = int(name.startswith('__host-'))
-        features['has_secure_prefix'] = int(name.startswith('__secure-'))
-        features['name_entropy'] = self._entropy(name)
-        features['name_length'] = len(name)
-        features['name_has_underscore'] = int('_' in name)
-
-        if value:
-            ent = self._entropy(value)
-            features['value_length'] = len(value)
-            features['value_entropy_bucket'] = 0 if ent < 2 else (1 if ent < 4 else 2)
-            features['value_looks_like_jwt'] = int(value.count('.') == 2 and len(value) > 50)
-            features['value_looks_like_hex'] = int(bool(re.match(r'^[a-f0-9]+$', value.lower())))
-            features['value_looks_base64'] = int(
-                len(set(value) - set('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=-_')) < max(len(set(value)) * 0.1, 1)
-            )
-            features['value_has_padding'] = int(value.endswith('='))
-            features['value_is_numeric'] = int(value.isdigit())
-            features['value_length_bucket'] = 0 if len(value) < 20 else (1 if len(value) < 50 else (2 if len(value) < 100 else 3))
+        if expiry:
+            # Epoch arithmetic: only ISO strings go through datetime
+            expiry_ts = expiry if isinstance(expiry, (int, float)) else datetime.fromisoformat(str(expiry)).timestamp()
+            days = max(int((expiry_ts - now) // _SECONDS_PER_DAY), 0)
+            is_session_cookie = 0
+            expiry_days = min(days, 365)
+            lifetime_category = bisect_right(_LIFETIME_BUCKETS, days)
         else:
-            for k in ['value_length', 'value_entropy_bucket', 'value_looks_like_jwt',
-                       'value_looks_like_hex', 'value_looks_base64', 'value_has_padding',
-                       'value_is_numeric', 'value_length_bucket']:
-                features[k] = 0
+            is_session_cookie = 1
+            expiry_days = 0
+            lifetime_category = 0
+
+        domain_is_wildcard = scope[0]
+        exposure_score = (
+            (2.0 if domain_is_wildcard else 1.0)
+            * (1 + expiry_days / 365.0)
+        )
 
         # ═══════════════════════════════════════════════════════════
         # GROUP 4: BEHAVIOR (8 features) - NEW IN 2.0
         # ═══════════════════════════════════════════════════════════
-        cookie_name = cookie.get('name', '')
         changed_cookies = context.get('changedCookies', [])
         login_event = context.get('loginEvent', False)
         before_index = context.get('beforeCookieIndex', {})
@@ -134,94 +303,208 @@ class CookieFeatureExtractor:
         # Direct behavior signals (from training data or runtime context)
         if 'changed_during_login' in cookie:
             # Training data path: behavior fields are embedded in cookie dict
-            features['f_changed_during_login'] = int(cookie.get('changed_during_login', 0))
-            features['f_new_after_login'] = int(cookie.get('new_after_login', 0))
-            features['f_rotated_after_login'] = int(cookie.get('rotated_after_login', 0))
+            f_changed_during_login = int(get('changed_during_login', 0))
+            f_new_after_login = int(get('new_after_login', 0))
+            f_rotated_after_login = int(get('rotated_after_login', 0))
         elif login_event and changed_cookies:
             # Runtime path: derive from context
-            features['f_changed_during_login'] = int(cookie_name in changed_cookies)
+            f_changed_during_login = int(raw_name in changed_cookies)
             if before_index:
-                was_present = cookie_name in before_index
-                features['f_new_after_login'] = int(not was_present)
-                features['f_rotated_after_login'] = int(
-                    was_present and before_index.get(cookie_name, {}).get('present', False)
+                was_present = raw_name in before_index
+                f_new_after_login = int(not was_present)
+                f_rotated_after_login = int(
+                    was_present and before_index.get(raw_name, {}).get('present', False)
                 )
             else:
-                features['f_new_after_login'] = int(cookie_name in changed_cookies)
-                features['f_rotated_after_login'] = 0
+                f_new_after_login = int(raw_name in changed_cookies)
+                f_rotated_after_login = 0
         else:
             # No login context: default to 0 (unknown)
-            features['f_changed_during_login'] = 0
-            features['f_new_after_login'] = 0
-            features['f_rotated_after_login'] = 0
+            f_changed_during_login = 0
+            f_new_after_login = 0
+            f_rotated_after_login = 0
 
         # Persistent days bucket: 0=session, 1=1-7d, 2=8-30d, 3=>30d
-        days = features['expiry_days']
-        if features['is_session_cookie']:
-            features['f_persistent_days_bucket'] = 0
-        elif days <= 7:
-            features['f_persistent_days_bucket'] = 1
-        elif days <= 30:
-            features['f_persistent_days_bucket'] = 2
+        if is_session_cookie:
+            f_persistent_days_bucket = 0
         else:
-            features['f_persistent_days_bucket'] = 3
+            f_persistent_days_bucket = 1 + bisect_left(_PERSIST_BUCKETS, expiry_days)
 
         # Subdomain shared: domain starts with "." or hostOnly is False
-        host_only = cookie.get('hostOnly')
-        features['f_subdomain_shared'] = int(
-            domain.startswith('.') or (host_only is not None and not host_only)
+        f_subdomain_shared = int(
+            domain_is_wildcard or (host_only is not None and not host_only)
         )
 
         # Third-party context
         if 'third_party' in cookie:
-            features['f_third_party_context'] = int(cookie.get('third_party', 0))
+            f_third_party_context = int(get('third_party', 0))
         elif current_domain:
             clean_domain = domain.lstrip('.')
-            features['f_third_party_context'] = int(
+            f_third_party_context = int(
                 clean_domain != current_domain and not clean_domain.endswith('.' + current_domain)
             )
         else:
-            features['f_third_party_context'] = 0
+            f_third_party_context = 0
 
         # Composite: login behavior score (0-3)
-        features['f_login_behavior_score'] = (
-            features['f_changed_during_login']
-            + features['f_new_after_login']
-            + features['f_rotated_after_login']
+        f_login_behavior_score = (
+            f_changed_during_login
+            + f_new_after_login
+            + f_rotated_after_login
+        )
+
+        return (
+            attributes + (is_session_cookie, expiry_days, lifetime_category)
+            + scope + (exposure_score,)
+            + lexical
+            + (f_changed_during_login, f_new_after_login, f_rotated_after_login,
+               f_persistent_days_bucket, f_subdomain_shared, f_third_party_context,
+               f_login_behavior_score, f_security_posture_score)
         )
 
+    def _compute_static_features(self, raw_name, domain, path, raw_samesite, secure, httponly):
+        """
+        Features that depend only on the cookie's metadata (no value, no expiry, no context).
+
+        Wrapped in an LRU cache per extractor (see __init__), so every
+        argument must be hashable.
+
+        Returns:
+            (attributes[4], scope[6], name lexical[8], security_posture_score)
+        """
+        name = raw_name.lower()
+        samesite = raw_samesite.lower()
+
+        # ═══════════════════════════════════════════════════════════
+        # GROUP 1: ATTRIBUTES (4 of 7 features; expiry ones in _feature_row)
+        # ═══════════════════════════════════════════════════════════
+        has_secure = int(secure)
+        has_httponly = int(httponly)
+        has_samesite = int(bool(raw_samesite))
+        samesite_level = _SAMESITE_LEVELS.get(samesite, 0)
+
+        # ═══════════════════════════════════════════════════════════
+        # GROUP 2: SCOPE (6 of 7 features; exposure_score in _feature_row)
+        # ═══════════════════════════════════════════════════════════
+        domain_is_wildcard = int(domain.startswith('.'))
+        domain_depth = domain.count('.')
+        etld_match = 1
+        path_is_root = int(path == '/')
+        path_depth = max(path.count('/') - 1, 0)
+        cross_site_sendable = int(not samesite or samesite in ('none', 'no_restriction'))
+
+        # ═══════════════════════════════════════════════════════════
+        # GROUP 3: LEXICAL (16 features)
+        # ═══════════════════════════════════════════════════════════
+        if self._NAME_AUTOMATON is not None:
+            # Single pass over the name fills all three category flags
+            hits = 0
+            for _, mask in self._NAME_AUTOMATON.iter(name):
+                hits |= mask
+            name_matches_auth = hits & 1
+            name_matches_tracking = int(bool(hits & 2) or name.startswith(self._TRACKING_PREFIXES))
+            name_matches_preference = (hits >> 2) & 1
+        else:
+            name_matches_auth = int(_contains_any(name, self._AUTH_SUBSTRINGS))
+            name_matches_tracking = int(
+                name.startswith(self._TRACKING_PREFIXES)
+                or _contains_any(name, self._TRACKING_SUBSTRINGS)
+            )
+            name_matches_preference = int(_contains_any(name, self._PREFERENCE_SUBSTRINGS))
+        # Slice compares instead of two startswith method calls
+        name_prefix = name[:9]
+        has_host_prefix = int(name_prefix[:7] == '__host-')
+        has_secure_prefix = int(name_prefix == '__secure-')
+        name_entropy = self._entropy(name)
+        name_length = len(name)
+        name_has_underscore = int('_' in name)
+
         # Composite: security posture score (0-3, higher = more secure)
-        features['f_security_posture_score'] = (
-            features['has_secure']
-            + features['has_httponly']
-            + min(features['samesite_level'], 1)  # 1 if lax or strict
+        f_security_posture_score = _POSTURE_LUT[
+            (has_secure << 2) | (has_httponly << 1) | (1 if samesite_level else 0)  # lax or strict
+        ]
+
+        return (
+            (has_secure, has_httponly, has_samesite, samesite_level),
+            (domain_is_wildcard, domain_depth, etld_match,
+             path_is_root, path_depth, cross_site_sendable),
+            (name_matches_auth, name_matches_tracking, name_matches_preference,
+             has_host_prefix, has_secure_prefix, name_entropy, name_length,
+             name_has_underscore),
+            f_security_posture_score,
         )
 
-        # Metadata (not used as model features, but useful for explainability)
-        features['_cookie_name'] = cookie.get('name')
-        features['_cookie_domain'] = cookie.get('domain')
+    def _value_features(self, value) -> tuple:
+        """
+        The 8 value-derived lexical features. Computed on every call, never
+        cached, so raw cookie values are not retained by the extractor.
+        """
+        if value:
+            value_length = len(value)
+            if _characterize_ascii is not None and value.isascii():
+                # Fused JIT kernel: one pass instead of five separate scans
+                ent, is_hex, is_b64, is_numeric, dot_count = _characterize_ascii(
+                    np.frombuffer(value.encode('ascii'), dtype=np.uint8), _B64_TABLE
+                )
+                value_looks_like_jwt = int(value_length > 50 and dot_count == 2)
+                value_looks_like_hex = int(is_hex)
+                value_looks_base64 = int(is_b64)
+                value_is_numeric = int(is_numeric)
+            else:
+                ent = self._entropy(value)
+                # Length gate first: short values never pay for the dot scan
+                value_looks_like_jwt = int(value_length > 50 and value.count('.') == 2)
+                value_looks_like_hex = int(_HEX_RE.match(value) is not None)
+                value_looks_base64 = self._looks_base64(value)
+                value_is_numeric = int(value.isdigit())
+            value_entropy_bucket = bisect_right(_ENTROPY_BUCKETS, ent)
+            value_has_padding = int(value[-1] == '=')
+            value_length_bucket = bisect_right(_VALUE_LEN_BUCKETS, value_length)
+        else:
+            value_length = value_entropy_bucket = value_looks_like_jwt = value_looks_like_hex = 0
+            value_looks_base64 = value_has_padding = value_is_numeric = value_length_bucket = 0
 
-        return features
+        return (value_length, value_entropy_bucket, value_looks_like_jwt, value_looks_like_hex,
+                value_looks_base64, value_has_padding, value_is_numeric, value_length_bucket)
+
+    def _looks_base64(self, value):
+        """1 if fewer than 10% (min 1) of the distinct chars fall outside the base64/base64url alphabet."""
+        distinct = set(value)
+        thresh = max(len(distinct) * 0.1, 1)
+        bad = 0
+        for c in distinct:
+            if c not in _B64_ALPHABET:
+                bad += 1
+                if bad >= thresh:
+                    return 0
+        return 1
 
     def _entropy(self, text):
         if not text:
             return 0.0
-        counts = {}
-        for c in text:
-            counts[c] = counts.get(c, 0) + 1
+        n = len(text)
+        if n < _COUNTER_MIN_LEN:
+            counts = {}
+            for c in text:
+                counts[c] = counts.get(c, 0) + 1
+        else:
+            # C-level counting wins once the string is long enough to amortize setup
+            counts = Counter(text)
         ent = 0.0
         for cnt in counts.values():
-            p = cnt / len(text)
+            p = cnt / n
             ent -= p * math.log2(p)
         return ent
 
     def get_feature_names(self):
-        """Return ordered list of all numeric feature names (no metadata)."""
-        names = []
-        for group_features in self.FEATURE_GROUPS.values():
-            names.extend(group_features)
-        return names
+        """Return ordered tuple of all numeric feature names (no metadata)."""
+        return self.FEATURE_NAMES
 
     def get_feature_groups(self):
         """Return feature group mapping for explainability."""
         return self.FEATURE_GROUPS.copy()
+
+
+def _extract_shard(cookies: List[Dict], context: Dict) -> np.ndarray:
+    """Worker entry point for extract_features_parallel."""
+    return CookieFeatureExtractor().extract_features_matrix(cookies, context)
@@ -8,26 +8,155 @@ Generates 5000+ samples with:
   - Realistic security misconfigurations
 """
 
+import os
 import json
-import random
+import base64
 import hashlib
-from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict
+from datetime import datetime
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is used instead
+    orjson = None
+
+_SECONDS_PER_DAY = 86400
+
+# Array dtype per field for TrainingDataGenerator.generate_dataset_columns
+_COLUMN_DTYPES = {
+    'name': object, 'value': object, 'domain': object, 'path': object,
+    'secure': np.bool_, 'httpOnly': np.bool_, 'sameSite': object,
+    'expirationDate': np.int64, 'hostOnly': np.bool_, 'site_id': object,
+    'changed_during_login': np.int8, 'new_after_login': np.int8,
+    'rotated_after_login': np.int8, 'third_party': np.int8, 'label': object,
+}
+
+
+def _dumps(record) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(record)
+    return json.dumps(record, separators=(',', ':')).encode('utf-8')
+
+
+def write_dataset(dataset, path) -> None:
+    """
+    Write cookies as a JSON array with one compact record per line.
+
+    Records are serialized and written one at a time (with orjson when
+    installed), so the whole pretty-printed document is never held in
+    memory; `dataset` may be any iterable of cookie dicts.
+    """
+    with open(path, 'wb') as f:
+        f.write(b'[')
+        sep = b'\n'
+        for cookie in dataset:
+            f.write(sep)
+            f.write(_dumps(cookie))
+            sep = b',\n'
+        f.write(b'\n]\n')
+
+
+def read_dataset(path) -> list:
+    """Load a cookie dataset written by write_dataset (or any JSON array), with orjson when installed."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+@lru_cache(maxsize=None)
+def _object_pool(options: tuple) -> np.ndarray:
+    """Object-array view of an options tuple, built once and reused as a gather source."""
+    pool = np.empty(len(options), dtype=object)
+    pool[:] = options
+    return pool
+
+
+@lru_cache(maxsize=None)
+def _weighted_name_pool(obvious: tuple, ambiguous: tuple) -> np.ndarray:
+    """
+    Sampling table with obvious names weighted 3:1 over ambiguous ones.
+
+    The weights are small integers, so repeating each obvious name three
+    times gives an exact constant-time table: a uniform index into it is a
+    weighted draw, with no CDF search per sample.
+    """
+    return _object_pool(obvious * 3 + ambiguous)
+
+
+@lru_cache(maxsize=None)
+def _host_only_flags(domains: tuple) -> np.ndarray:
+    """hostOnly per domain: anything not '.'-scoped is host-only."""
+    return np.array([not d.startswith('.') for d in domains], dtype=bool)
+
+
+def _flatten_sites(sites, max_domains=None):
+    """
+    Flatten the site table for vectorized picks.
+
+    Returns (site_ids, domains, host_only) with one entry per (site, domain)
+    pair, plus each site's offset into them and its domain count.
+    """
+    site_ids, domains, offsets, counts = [], [], [], []
+    for site in sites:
+        options = site['domains'][:max_domains]
+        offsets.append(len(domains))
+        counts.append(len(options))
+        site_ids.extend([site['site_id']] * len(options))
+        domains.extend(options)
+    return (_object_pool(tuple(site_ids)), _object_pool(tuple(domains)),
+            _host_only_flags(tuple(domains)), np.array(offsets), np.array(counts))
+
+
+def _member_mask(values: np.ndarray, members: frozenset) -> np.ndarray:
+    """Boolean mask of which entries of an object array are in `members`."""
+    return np.fromiter(map(members.__contains__, values), dtype=bool, count=values.size)
+
+
+def _join_fixed(blob: str, k: int, widths: tuple, sep: str) -> list:
+    """
+    Cut blob into k rows of sum(widths) characters and join each row's
+    fields with sep, e.g. widths (8, 4, 4, 4, 12) with '-' for UUIDs.
+    Done as column copies in a (k, width) byte matrix, not per-row slicing.
+    """
+    width = sum(widths)
+    src = np.frombuffer(blob[:k * width].encode('ascii'), dtype=np.uint8).reshape(k, width)
+    out_width = width + len(widths) - 1
+    out = np.full((k, out_width), ord(sep), dtype=np.uint8)
+    pos = src_pos = 0
+    for w in widths:
+        out[:, pos:pos + w] = src[:, src_pos:src_pos + w]
+        pos += w + 1
+        src_pos += w
+    return _split(out.tobytes().decode('ascii'), [out_width] * k)
+
+
+def _split(blob: str, lengths) -> list:
+    """Cut consecutive pieces of the given lengths off the front of blob."""
+    out, pos = [], 0
+    for length in lengths:
+        out.append(blob[pos:pos + length])
+        pos += length
+    return out
 
 
 class TrainingDataGenerator:
     """Generate labeled cookie data with behavior features for training"""
 
     # ─── Authentication cookie patterns ──────────────────────
-    AUTH_NAMES_OBVIOUS = [
+    AUTH_NAMES_OBVIOUS = (
         'session_id', 'JSESSIONID', 'PHPSESSID', 'ASP.NET_SessionId',
         'auth_token', 'login_token', 'access_token', 'jwt_token',
         'laravel_session', 'connect.sid', 'wordpress_logged_in',
         'sid', 'sessionid', 'user_session', 'bearer_token',
         '__Host-session', '__Secure-auth', 'sso_token', 'refresh_token',
-    ]
+    )
 
     # Auth cookies with non-obvious names
-    AUTH_NAMES_AMBIGUOUS = [
+    AUTH_NAMES_AMBIGUOUS = (
         'id', 'token', 'sess', 'remember_me', 'persistent_login',
         '_t', 'li_at', 'c_user', 'xs',
         'SID', 'HSID', 'SSID', 'APISID', 'SAPISID',
@@ -37,18 +166,18 @@ class TrainingDataGenerator:
         'rack.session', '_myapp_session', 'express:sess',
         'ci_session', 'PLAY_SESSION', '_session_id',
         'sc_anonymous_id', 'mp_userid', 'device_id',
-    ]
+    )
 
     # ─── Tracking cookie patterns ────────────────────────────
-    TRACKING_NAMES_OBVIOUS = [
+    TRACKING_NAMES_OBVIOUS = (
         '_ga', '_gid', '_gat', '__utma', '__utmb', '__utmc', '__utmz',
         '_fbp', 'fr', 'DoubleClickId', 'IDE',
         'amplitude_id', 'mp_mixpanel', 'analytics_token',
         'tracking_id', '_clck', '_clsk', 'hubspotutk',
         'ajs_anonymous_id', '__gads', 'NID', '1P_JAR',
-    ]
+    )
 
-    TRACKING_NAMES_AMBIGUOUS = [
+    TRACKING_NAMES_AMBIGUOUS = (
         'visitor_id', '_vis', 'uid', '_uuid', 'cid',
         'client_id', '_gcl_au', '_dc_gtm_UA', '_hjid',
         'intercom-id', 'intercom-session',
@@ -60,10 +189,10 @@ class TrainingDataGenerator:
         'YSC', 'VISITOR_INFO1_LIVE',
         '_uetsid', '_uetvid',
         'personalization_id',
-    ]
+    )
 
     # ─── Preference cookie patterns ──────────────────────────
-    PREFERENCE_NAMES = [
+    PREFERENCE_NAMES = (
         'language', 'lang', 'locale', 'timezone', 'tz',
         'theme', 'dark_mode', 'currency', 'region',
         'cookie_consent', 'gdpr_consent', 'preferences',
@@ -72,10 +201,10 @@ class TrainingDataGenerator:
         'cookieyes-consent', 'CookieConsent', 'euconsent-v2',
         'OptanonConsent', 'OptanonAlertBoxClosed',
         'nf_lang', 'wp_lang', 'PREF', 'i18n_lang',
-    ]
+    )
 
     # ─── Other/functional cookies ────────────────────────────
-    OTHER_NAMES = [
+    OTHER_NAMES = (
         'csrf_token', 'cache_id', 'ab_test_variant',
         'load_balancer', 'debug_mode', 'feature_flag',
         'temp_id', 'referrer', 'utm_source', 'nonce',
@@ -88,263 +217,371 @@ class TrainingDataGenerator:
         'incap_ses', 'visid_incap',
         'bm_sv', 'bm_sz',
         '_dd_s', 'newrelic', 'akamai_generated',
-    ]
+    )
 
     # ─── 22 sites across diverse verticals ───────────────────
-    SITES = [
-        {'site_id': 'bank_chase', 'domains': ['secure.chase.com', '.chase.com', 'auth.chase.com']},
-        {'site_id': 'bank_bofa', 'domains': ['www.bankofamerica.com', '.bankofamerica.com', 'secure.bankofamerica.com']},
-        {'site_id': 'ecom_amazon', 'domains': ['www.amazon.com', '.amazon.com', 'api.amazon.com']},
-        {'site_id': 'ecom_shopify', 'domains': ['mystore.myshopify.com', '.myshopify.com', 'checkout.shopify.com']},
-        {'site_id': 'social_facebook', 'domains': ['www.facebook.com', '.facebook.com', 'api.facebook.com']},
-        {'site_id': 'social_twitter', 'domains': ['twitter.com', '.twitter.com', 'api.twitter.com']},
-        {'site_id': 'social_reddit', 'domains': ['www.reddit.com', '.reddit.com', 'oauth.reddit.com']},
-        {'site_id': 'news_nyt', 'domains': ['www.nytimes.com', '.nytimes.com', 'myaccount.nytimes.com']},
-        {'site_id': 'news_bbc', 'domains': ['www.bbc.com', '.bbc.com', 'account.bbc.com']},
-        {'site_id': 'saas_github', 'domains': ['github.com', '.github.com', 'api.github.com']},
-        {'site_id': 'saas_slack', 'domains': ['app.slack.com', '.slack.com', 'api.slack.com']},
-        {'site_id': 'saas_notion', 'domains': ['www.notion.so', '.notion.so', 'api.notion.so']},
-        {'site_id': 'health_portal', 'domains': ['portal.myhealth.org', '.myhealth.org', 'api.myhealth.org']},
-        {'site_id': 'health_epic', 'domains': ['mychart.epic.com', '.epic.com', 'auth.epic.com']},
-        {'site_id': 'edu_canvas', 'domains': ['school.instructure.com', '.instructure.com', 'api.instructure.com']},
-        {'site_id': 'edu_coursera', 'domains': ['www.coursera.org', '.coursera.org', 'api.coursera.org']},
-        {'site_id': 'gaming_steam', 'domains': ['store.steampowered.com', '.steampowered.com', 'login.steampowered.com']},
-        {'site_id': 'gaming_epic', 'domains': ['www.epicgames.com', '.epicgames.com', 'account.epicgames.com']},
-        {'site_id': 'gov_portal', 'domains': ['login.gov', '.login.gov', 'secure.login.gov']},
-        {'site_id': 'travel_airline', 'domains': ['www.united.com', '.united.com', 'booking.united.com']},
-        {'site_id': 'media_spotify', 'domains': ['open.spotify.com', '.spotify.com', 'accounts.spotify.com']},
-        {'site_id': 'media_netflix', 'domains': ['www.netflix.com', '.netflix.com', 'api.netflix.com']},
-    ]
-
-    def _pick_site(self):
-        return random.choice(self.SITES)
+    SITES = (
+        {'site_id': 'bank_chase', 'domains': ('secure.chase.com', '.chase.com', 'auth.chase.com')},
+        {'site_id': 'bank_bofa', 'domains': ('www.bankofamerica.com', '.bankofamerica.com', 'secure.bankofamerica.com')},
+        {'site_id': 'ecom_amazon', 'domains': ('www.amazon.com', '.amazon.com', 'api.amazon.com')},
+        {'site_id': 'ecom_shopify', 'domains': ('mystore.myshopify.com', '.myshopify.com', 'checkout.shopify.com')},
+        {'site_id': 'social_facebook', 'domains': ('www.facebook.com', '.facebook.com', 'api.facebook.com')},
+        {'site_id': 'social_twitter', 'domains': ('twitter.com', '.twitter.com', 'api.twitter.com')},
+        {'site_id': 'social_reddit', 'domains': ('www.reddit.com', '.reddit.com', 'oauth.reddit.com')},
+        {'site_id': 'news_nyt', 'domains': ('www.nytimes.com', '.nytimes.com', 'myaccount.nytimes.com')},
+        {'site_id': 'news_bbc', 'domains': ('www.bbc.com', '.bbc.com', 'account.bbc.com')},
+        {'site_id': 'saas_github', 'domains': ('github.com', '.github.com', 'api.github.com')},
+        {'site_id': 'saas_slack', 'domains': ('app.slack.com', '.slack.com', 'api.slack.com')},
+        {'site_id': 'saas_notion', 'domains': ('www.notion.so', '.notion.so', 'api.notion.so')},
+        {'site_id': 'health_portal', 'domains': ('portal.myhealth.org', '.myhealth.org', 'api.myhealth.org')},
+        {'site_id': 'health_epic', 'domains': ('mychart.epic.com', '.epic.com', 'auth.epic.com')},
+        {'site_id': 'edu_canvas', 'domains': ('school.instructure.com', '.instructure.com', 'api.instructure.com')},
+        {'site_id': 'edu_coursera', 'domains': ('www.coursera.org', '.coursera.org', 'api.coursera.org')},
+        {'site_id': 'gaming_steam', 'domains': ('store.steampowered.com', '.steampowered.com', 'login.steampowered.com')},
+        {'site_id': 'gaming_epic', 'domains': ('www.epicgames.com', '.epicgames.com', 'account.epicgames.com')},
+        {'site_id': 'gov_portal', 'domains': ('login.gov', '.login.gov', 'secure.login.gov')},
+        {'site_id': 'travel_airline', 'domains': ('www.united.com', '.united.com', 'booking.united.com')},
+        {'site_id': 'media_spotify', 'domains': ('open.spotify.com', '.spotify.com', 'accounts.spotify.com')},
+        {'site_id': 'media_netflix', 'domains': ('www.netflix.com', '.netflix.com', 'api.netflix.com')},
+    )
+
+    # Third-party tracker domains used for ~50% of tracking cookies
+    TRACKER_DOMAINS = (
+        '.analytics.tracker.com', '.doubleclick.net', '.facebook.com',
+        '.google-analytics.com', '.hotjar.com', '.clarity.ms', '.segment.io',
+    )
+
+    PREFERENCE_VALUES = (
+        'en-US', 'es-ES', 'fr-FR', 'de-DE', 'ja-JP', 'zh-CN', 'ko-KR',
+        'dark', 'light', 'auto', 'system',
+        'UTC', 'America/New_York', 'Europe/London', 'Asia/Tokyo',
+        'USD', 'EUR', 'GBP', 'JPY',
+        'true', 'false', '1', '0',
+        'compact', 'comfortable', 'default',
+    )
+
+    LABELS = ('authentication', 'tracking', 'preference', 'other')
+
+    # Name subsets that change how a cookie is generated, resolved once
+    # from the pools above so per-row checks are set lookups
+    _FLAG_VALUE_NAMES = frozenset({'remember_me', 'persistent_login', 'device_id'})
+    _CONSENT_NAMES = frozenset(
+        n for n in PREFERENCE_NAMES if 'consent' in n.lower() or 'optanon' in n.lower()
+    )
+    _CSRF_NAMES = frozenset(n for n in OTHER_NAMES if 'csrf' in n.lower() or 'xsrf' in n.lower())
+    _TOKEN_VALUE_NAMES = frozenset({'nonce', 'request_id'})
+
+    # Share of auth/tracking/other cookies generated in 'hard' (ambiguous) mode
+    HARD_FRACTION = 0.40
+
+    def __init__(self, seed=None):
+        """seed: anything np.random.default_rng accepts (int, SeedSequence or Generator)."""
+        # All randomness comes from one numpy Generator, drawn in per-class batches
+        self._rng = np.random.default_rng(seed)
+        # One reference time for every expiry/timestamp this generator emits
+        self._now_ts = datetime.now().timestamp()
+        # Flattened site/domain tables: all domains, and the first two only
+        self._site_tables = {cap: _flatten_sites(self.SITES, cap) for cap in (None, 2)}
+
+    # ─── Single-cookie API (batches of one) ──────────────────
 
     def generate_auth_cookie(self, difficulty='normal') -> dict:
-        site = self._pick_site()
-        if difficulty == 'hard':
-            name = random.choice(self.AUTH_NAMES_AMBIGUOUS)
-        else:
-            pool = self.AUTH_NAMES_OBVIOUS + self.AUTH_NAMES_AMBIGUOUS
-            weights = [3] * len(self.AUTH_NAMES_OBVIOUS) + [1] * len(self.AUTH_NAMES_AMBIGUOUS)
-            name = random.choices(pool, weights=weights, k=1)[0]
-
-        if difficulty == 'hard':
-            secure = random.random() > 0.4
-            http_only = random.random() > 0.5
-            same_site = random.choice([None, None, 'Lax', None])
-        else:
-            secure = random.random() > 0.1
-            http_only = random.random() > 0.3
-            same_site = random.choice(['Strict', 'Lax', 'Lax', None])
-
-        if random.random() > 0.4:
-            expiry = None
-        else:
-            days = random.choice([1, 7, 14, 30, 60, 90, 180, 365])
-            expiry = int((datetime.now() + timedelta(days=days)).timestamp())
-
-        domain = random.choice(site['domains'])
-
-        if difficulty == 'hard':
-            changed_during_login = 1 if random.random() < 0.55 else 0
-            new_after_login = 1 if random.random() < 0.50 else 0
-            rotated_after_login = 1 if random.random() < 0.45 else 0
-        else:
-            changed_during_login = 1 if random.random() < 0.82 else 0
-            new_after_login = 1 if random.random() < 0.75 else 0
-            rotated_after_login = 1 if random.random() < 0.70 else 0
-
-        third_party = 1 if random.random() < 0.05 else 0
-
-        if name in ('remember_me', 'persistent_login', 'device_id'):
-            value = random.choice(['true', '1', self._random_hex(8)])
-        else:
-            value = self._generate_token_value()
+        return self._generate_class_batch('authentication', 1, hard=np.array([difficulty == 'hard']))[0]
+
+    def generate_tracking_cookie(self, difficulty='normal') -> dict:
+        return self._generate_class_batch('tracking', 1, hard=np.array([difficulty == 'hard']))[0]
+
+    def generate_preference_cookie(self, difficulty='normal') -> dict:
+        return self._generate_class_batch('preference', 1)[0]
+
+    def generate_other_cookie(self, difficulty='normal') -> dict:
+        return self._generate_class_batch('other', 1, hard=np.array([difficulty == 'hard']))[0]
+
+    # ─── Batch generation ────────────────────────────────────
+
+    def _generate_class_batch(self, label: str, n: int, hard=None) -> list:
+        """
+        Generate n cookies of one class.
+
+        Every random attribute is drawn as a column over the whole batch
+        (struct-of-arrays); rows are only assembled into dicts at the end.
+
+        Args:
+            label: 'authentication', 'tracking', 'preference' or 'other'
+            n: Number of cookies
+            hard: Optional bool array marking 'hard' rows; drawn with
+                  HARD_FRACTION when omitted (ignored for preference)
+        """
+        cols = self._class_columns(label, n, hard)
+        return [
+            {
+                'name': name, 'value': value, 'domain': domain, 'path': path,
+                'secure': secure, 'httpOnly': http_only, 'sameSite': same_site,
+                'expirationDate': expiry, 'hostOnly': host_only,
+                'site_id': site_id,
+                'changed_during_login': changed,
+                'new_after_login': new,
+                'rotated_after_login': rotated,
+                'third_party': third_party, 'label': label
+            }
+            for name, value, domain, path, secure, http_only, same_site, expiry, host_only,
+                site_id, changed, new, rotated, third_party in zip(
+                cols['name'], cols['value'], cols['domain'], cols['path'],
+                cols['secure'], cols['httpOnly'], cols['sameSite'], cols['expirationDate'],
+                cols['hostOnly'], cols['site_id'], cols['changed_during_login'],
+                cols['new_after_login'], cols['rotated_after_login'], cols['third_party'],
+            )
+        ]
+
+    def _class_columns(self, label: str, n: int, hard=None) -> dict:
+        """Column lists (one per cookie field except 'label') for n cookies of one class."""
+        if hard is None:
+            hard = self._rng.random(n) < self.HARD_FRACTION
+        build = {
+            'authentication': self._auth_columns,
+            'tracking': self._tracking_columns,
+            'preference': self._preference_columns,
+            'other': self._other_columns,
+        }[label]
+        return build(n, hard)
+
+    def _auth_columns(self, n, hard) -> dict:
+        rng = self._rng
+        names = self._pick_names(hard, self.AUTH_NAMES_OBVIOUS, self.AUTH_NAMES_AMBIGUOUS)
+        site_ids, domains, host_only = self._pick_sites(n)
+
+        # Flag-style names get a short flag value, everything else a token
+        flag_like = _member_mask(names, self._FLAG_VALUE_NAMES)
+        values = np.empty(n, dtype=object)
+        values[~flag_like] = self._token_values(int((~flag_like).sum()))
+        n_flags = int(flag_like.sum())
+        flag_values = self._choice(('true', '1', None), n_flags)
+        hex_rows = flag_values == None  # noqa: E711 - elementwise on an object array
+        flag_values[hex_rows] = self._random_hex_batch([8] * int(hex_rows.sum()))
+        values[flag_like] = flag_values
 
         return {
-            'name': name, 'value': value, 'domain': domain, 'path': '/',
-            'secure': secure, 'httpOnly': http_only, 'sameSite': same_site,
-            'expirationDate': expiry, 'hostOnly': not domain.startswith('.'),
-            'site_id': site['site_id'],
-            'changed_during_login': changed_during_login,
-            'new_after_login': new_after_login,
-            'rotated_after_login': rotated_after_login,
-            'third_party': third_party, 'label': 'authentication'
+            'name': names.tolist(),
+            'value': values.tolist(),
+            'domain': domains.tolist(),
+            'hostOnly': host_only.tolist(),
+            'path': ['/'] * n,
+            'secure': (rng.random(n) > np.where(hard, 0.4, 0.1)).tolist(),
+            'httpOnly': (rng.random(n) > np.where(hard, 0.5, 0.3)).tolist(),
+            'sameSite': np.where(hard, self._choice((None, None, 'Lax', None), n),
+                                 self._choice(('Strict', 'Lax', 'Lax', None), n)).tolist(),
+            'expirationDate': self._expiries(rng.random(n) > 0.4, (1, 7, 14, 30, 60, 90, 180, 365)),
+            'site_id': site_ids.tolist(),
+            'changed_during_login': self._flags(hard, 0.55, 0.82),
+            'new_after_login': self._flags(hard, 0.50, 0.75),
+            'rotated_after_login': self._flags(hard, 0.45, 0.70),
+            'third_party': self._flags(hard, 0.05, 0.05),
         }
 
-    def generate_tracking_cookie(self, difficulty='normal') -> dict:
-        site = self._pick_site()
-        if difficulty == 'hard':
-            name = random.choice(self.TRACKING_NAMES_AMBIGUOUS)
-        else:
-            pool = self.TRACKING_NAMES_OBVIOUS + self.TRACKING_NAMES_AMBIGUOUS
-            weights = [3] * len(self.TRACKING_NAMES_OBVIOUS) + [1] * len(self.TRACKING_NAMES_AMBIGUOUS)
-            name = random.choices(pool, weights=weights, k=1)[0]
-
-        secure = random.random() > 0.6
-        http_only = random.random() > 0.9
-        same_site = random.choice([None, None, 'Lax', None, 'None'])
-
-        days = random.choice([30, 90, 180, 365, 730])
-        expiry = int((datetime.now() + timedelta(days=days)).timestamp())
-
-        if random.random() < 0.5:
-            domain = random.choice(site['domains'])
-        else:
-            domain = random.choice([
-                '.analytics.tracker.com', '.doubleclick.net', '.facebook.com',
-                '.google-analytics.com', '.hotjar.com', '.clarity.ms', '.segment.io',
-            ])
-
-        if difficulty == 'hard':
-            changed_during_login = 1 if random.random() < 0.25 else 0
-            new_after_login = 1 if random.random() < 0.20 else 0
-            rotated_after_login = 1 if random.random() < 0.15 else 0
-        else:
-            changed_during_login = 1 if random.random() < 0.10 else 0
-            new_after_login = 1 if random.random() < 0.08 else 0
-            rotated_after_login = 1 if random.random() < 0.05 else 0
-
-        third_party = 1 if random.random() < 0.65 else 0
-
-        if difficulty == 'hard' and random.random() < 0.3:
-            value = self._generate_token_value()
-        else:
-            value = self._generate_tracking_value()
+    def _tracking_columns(self, n, hard) -> dict:
+        rng = self._rng
+        names = self._pick_names(hard, self.TRACKING_NAMES_OBVIOUS, self.TRACKING_NAMES_AMBIGUOUS)
+        site_ids, domains, host_only = self._pick_sites(n)
+        # Half the cookies are set by an external tracker domain
+        tracker_rows = rng.random(n) >= 0.5
+        picks = rng.integers(len(self.TRACKER_DOMAINS), size=int(tracker_rows.sum()))
+        domains[tracker_rows] = _object_pool(self.TRACKER_DOMAINS)[picks]
+        host_only[tracker_rows] = _host_only_flags(self.TRACKER_DOMAINS)[picks]
+
+        # Some hard tracking cookies carry token-looking values
+        token_rows = hard & (rng.random(n) < 0.3)
+        values = np.empty(n, dtype=object)
+        values[token_rows] = self._token_values(int(token_rows.sum()))
+        values[~token_rows] = self._tracking_values(int((~token_rows).sum()))
 
         return {
-            'name': name, 'value': value, 'domain': domain, 'path': '/',
-            'secure': secure, 'httpOnly': http_only, 'sameSite': same_site,
-            'expirationDate': expiry, 'hostOnly': not domain.startswith('.'),
-            'site_id': site['site_id'],
-            'changed_during_login': changed_during_login,
-            'new_after_login': new_after_login,
-            'rotated_after_login': rotated_after_login,
-            'third_party': third_party, 'label': 'tracking'
+            'name': names.tolist(),
+            'value': values.tolist(),
+            'domain': domains.tolist(),
+            'hostOnly': host_only.tolist(),
+            'path': ['/'] * n,
+            'secure': (rng.random(n) > 0.6).tolist(),
+            'httpOnly': (rng.random(n) > 0.9).tolist(),
+            'sameSite': self._choice((None, None, 'Lax', None, 'None'), n).tolist(),
+            'expirationDate': self._expiries(np.zeros(n, dtype=bool), (30, 90, 180, 365, 730)),
+            'site_id': site_ids.tolist(),
+            'changed_during_login': self._flags(hard, 0.25, 0.10),
+            'new_after_login': self._flags(hard, 0.20, 0.08),
+            'rotated_after_login': self._flags(hard, 0.15, 0.05),
+            'third_party': self._flags(hard, 0.65, 0.65),
         }
 
-    def generate_preference_cookie(self, difficulty='normal') -> dict:
-        site = self._pick_site()
-        name = random.choice(self.PREFERENCE_NAMES)
-        secure = random.random() > 0.5
-        http_only = random.random() > 0.8
-        same_site = random.choice(['Lax', None, 'Strict'])
-        days = random.choice([30, 90, 180, 365])
-        expiry = int((datetime.now() + timedelta(days=days)).timestamp())
-        domain = random.choice(site['domains'])
-
-        changed_during_login = 1 if random.random() < 0.15 else 0
-        new_after_login = 1 if random.random() < 0.10 else 0
-        rotated_after_login = 1 if random.random() < 0.05 else 0
-        third_party = 1 if random.random() < 0.10 else 0
-
-        if 'consent' in name.lower() or 'optanon' in name.lower():
-            value = self._random_base64(random.randint(40, 120))
-        else:
-            value = self._generate_preference_value()
+    def _preference_columns(self, n, hard) -> dict:
+        rng = self._rng
+        names = self._choice(self.PREFERENCE_NAMES, n)
+        site_ids, domains, host_only = self._pick_sites(n)
+        never = np.zeros(n, dtype=bool)  # preference cookies have no difficulty split
+
+        consent_like = _member_mask(names, self._CONSENT_NAMES)
+        values = np.empty(n, dtype=object)
+        values[consent_like] = self._random_base64_batch(
+            rng.integers(40, 121, size=int(consent_like.sum())).tolist()
+        )
+        values[~consent_like] = self._choice(self.PREFERENCE_VALUES, int((~consent_like).sum()))
 
         return {
-            'name': name, 'value': value, 'domain': domain, 'path': '/',
-            'secure': secure, 'httpOnly': http_only, 'sameSite': same_site,
-            'expirationDate': expiry, 'hostOnly': not domain.startswith('.'),
-            'site_id': site['site_id'],
-            'changed_during_login': changed_during_login,
-            'new_after_login': new_after_login,
-            'rotated_after_login': rotated_after_login,
-            'third_party': third_party, 'label': 'preference'
+            'name': names.tolist(),
+            'value': values.tolist(),
+            'domain': domains.tolist(),
+            'hostOnly': host_only.tolist(),
+            'path': ['/'] * n,
+            'secure': (rng.random(n) > 0.5).tolist(),
+            'httpOnly': (rng.random(n) > 0.8).tolist(),
+            'sameSite': self._choice(('Lax', None, 'Strict'), n).tolist(),
+            'expirationDate': self._expiries(never, (30, 90, 180, 365)),
+            'site_id': site_ids.tolist(),
+            'changed_during_login': self._flags(never, 0.15, 0.15),
+            'new_after_login': self._flags(never, 0.10, 0.10),
+            'rotated_after_login': self._flags(never, 0.05, 0.05),
+            'third_party': self._flags(never, 0.10, 0.10),
         }
 
-    def generate_other_cookie(self, difficulty='normal') -> dict:
-        site = self._pick_site()
-        name = random.choice(self.OTHER_NAMES)
-        secure = random.random() > 0.5
-        http_only = random.random() > 0.5
-        same_site = random.choice(['Strict', 'Lax', None])
-
-        if random.random() > 0.5:
-            expiry = None
-        else:
-            days = random.choice([0, 1, 7, 30, 90])
-            expiry = int((datetime.now() + timedelta(days=days)).timestamp())
-
-        domain = random.choice(site['domains'][:2])
-
-        is_csrf_like = 'csrf' in name.lower() or 'xsrf' in name.lower()
-        if is_csrf_like:
-            changed_during_login = 1 if random.random() < 0.70 else 0
-            new_after_login = 1 if random.random() < 0.50 else 0
-            rotated_after_login = 1 if random.random() < 0.60 else 0
-        else:
-            changed_during_login = 1 if random.random() < 0.20 else 0
-            new_after_login = 1 if random.random() < 0.15 else 0
-            rotated_after_login = 1 if random.random() < 0.15 else 0
-
-        third_party = 1 if random.random() < 0.15 else 0
-
-        if is_csrf_like or name in ('nonce', 'request_id'):
-            value = self._generate_token_value()
-        else:
-            value = self._generate_random_value()
+    def _other_columns(self, n, hard) -> dict:
+        rng = self._rng
+        names = self._choice(self.OTHER_NAMES, n)
+        # Functional cookies stay on the site's first two domains
+        site_ids, domains, host_only = self._pick_sites(n, max_domains=2)
+
+        csrf_like = _member_mask(names, self._CSRF_NAMES)
+        token_rows = csrf_like | _member_mask(names, self._TOKEN_VALUE_NAMES)
+        values = np.empty(n, dtype=object)
+        values[token_rows] = self._token_values(int(token_rows.sum()))
+        values[~token_rows] = self._random_values(int((~token_rows).sum()))
 
         return {
-            'name': name, 'value': value, 'domain': domain,
-            'path': random.choice(['/', '/api', '/admin', '/app']),
-            'secure': secure, 'httpOnly': http_only, 'sameSite': same_site,
-            'expirationDate': expiry, 'hostOnly': not domain.startswith('.'),
-            'site_id': site['site_id'],
-            'changed_during_login': changed_during_login,
-            'new_after_login': new_after_login,
-            'rotated_after_login': rotated_after_login,
-            'third_party': third_party, 'label': 'other'
+            'name': names.tolist(),
+            'value': values.tolist(),
+            'domain': domains.tolist(),
+            'hostOnly': host_only.tolist(),
+            'path': self._choice(('/', '/api', '/admin', '/app'), n).tolist(),
+            'secure': (rng.random(n) > 0.5).tolist(),
+            'httpOnly': (rng.random(n) > 0.5).tolist(),
+            'sameSite': self._choice(('Strict', 'Lax', None), n).tolist(),
+            'expirationDate': self._expiries(rng.random(n) > 0.5, (0, 1, 7, 30, 90)),
+            'site_id': site_ids.tolist(),
+            # Behavior rates split on CSRF-like names rather than difficulty
+            'changed_during_login': self._flags(csrf_like, 0.70, 0.20),
+            'new_after_login': self._flags(csrf_like, 0.50, 0.15),
+            'rotated_after_login': self._flags(csrf_like, 0.60, 0.15),
+            'third_party': self._flags(csrf_like, 0.15, 0.15),
         }
 
-    # ─── Value generators ────────────────────────────────────
-
-    def _generate_token_value(self) -> str:
-        r = random.random()
-        if r < 0.35:
-            parts = [self._random_base64(20), self._random_base64(40), self._random_base64(30)]
-            return '.'.join(parts)
-        elif r < 0.65:
-            return self._random_hex(random.choice([16, 24, 32, 40, 64]))
-        elif r < 0.85:
-            return self._random_base64(random.choice([20, 32, 44, 64]))
-        else:
-            h = self._random_hex(32)
-            return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
-
-    def _generate_tracking_value(self) -> str:
-        formats = [
-            f"GA1.2.{random.randint(100000000, 999999999)}.{int(datetime.now().timestamp())}",
-            f"GA1.3.{random.randint(100000000, 999999999)}.{int(datetime.now().timestamp())}",
-            self._random_hex(16),
-            f"v1.{random.randint(10000, 99999)}.{self._random_hex(12)}",
-            f"amp-{self._random_base64(22)}",
-            f"{random.randint(1000000, 9999999)}.{random.randint(1000000, 9999999)}",
-            f"fb.1.{int(datetime.now().timestamp())}.{random.randint(100000000, 999999999)}",
-        ]
-        return random.choice(formats)
-
-    def _generate_preference_value(self) -> str:
-        values = [
-            'en-US', 'es-ES', 'fr-FR', 'de-DE', 'ja-JP', 'zh-CN', 'ko-KR',
-            'dark', 'light', 'auto', 'system',
-            'UTC', 'America/New_York', 'Europe/London', 'Asia/Tokyo',
-            'USD', 'EUR', 'GBP', 'JPY',
-            'true', 'false', '1', '0',
-            'compact', 'comfortable', 'default',
-        ]
-        return random.choice(values)
+    # ─── Column helpers ──────────────────────────────────────
 
-    def _generate_random_value(self) -> str:
-        return self._random_hex(random.choice([4, 8, 12, 16, 24]))
+    def _choice(self, options, n) -> np.ndarray:
+        """n uniform picks from an options tuple, as an object array (keeps None and str as-is)."""
+        return _object_pool(options)[self._rng.integers(len(options), size=n)]
 
-    def _random_hex(self, length: int) -> str:
-        return ''.join(random.choices('0123456789abcdef', k=length))
+    def _flags(self, mask, p_masked, p_other) -> list:
+        """0/1 draws with P(1) = p_masked on rows where mask is set, p_other elsewhere."""
+        return (self._rng.random(mask.size) < np.where(mask, p_masked, p_other)).astype(int).tolist()
 
-    def _random_base64(self, length: int) -> str:
-        chars = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_'
-        return ''.join(random.choices(chars, k=length))
+    def _pick_names(self, hard, obvious, ambiguous) -> np.ndarray:
+        """Hard rows draw uniformly from the ambiguous names; normal rows weight obvious names 3:1."""
+        table = _weighted_name_pool(obvious, ambiguous)
+        names = table[self._rng.integers(len(table), size=hard.size)]
+        names[hard] = self._choice(ambiguous, int(hard.sum()))
+        return names
+
+    def _pick_sites(self, n, max_domains=None):
+        """
+        Random site per row plus one of its domains.
+
+        Returns (site_ids, domains, host_only) arrays gathered from the
+        flattened site table, so no per-row lookups or string checks.
+        """
+        site_ids, domains, host_only, offsets, counts = self._site_tables[max_domains]
+        picks = self._rng.integers(len(offsets), size=n)
+        slots = offsets[picks] + (self._rng.random(n) * counts[picks]).astype(np.intp)
+        return site_ids[slots], domains[slots], host_only[slots]
+
+    def _expiries(self, session_rows, day_options) -> list:
+        """Epoch expiries `day_options` days out (uniform pick); None on session rows."""
+        days = np.array(day_options)[self._rng.integers(len(day_options), size=session_rows.size)]
+        expiries = (self._now_ts + days * _SECONDS_PER_DAY).astype(np.int64).tolist()
+        for i in np.flatnonzero(session_rows).tolist():
+            expiries[i] = None
+        return expiries
+
+    # ─── Value generators (batched) ──────────────────────────
+
+    def _token_values(self, n) -> list:
+        """JWT-like, hex, base64 or UUID-shaped session token values."""
+        rng = self._rng
+        r = rng.random(n)
+        jwt_rows = np.flatnonzero(r < 0.35)
+        hex_rows = np.flatnonzero((r >= 0.35) & (r < 0.65))
+        b64_rows = np.flatnonzero((r >= 0.65) & (r < 0.85))
+        uuid_rows = np.flatnonzero(r >= 0.85)
+
+        values = np.empty(n, dtype=object)
+        # Fixed-shape tokens (header.payload.signature, 8-4-4-4-12 UUIDs) are
+        # assembled for all rows at once in a byte matrix
+        values[jwt_rows] = _join_fixed(
+            self._random_base64_blob(90 * jwt_rows.size), jwt_rows.size, (20, 40, 30), '.'
+        )
+        hex_lengths = np.array([16, 24, 32, 40, 64])[rng.integers(5, size=hex_rows.size)]
+        values[hex_rows] = self._random_hex_batch(hex_lengths.tolist())
+        b64_lengths = np.array([20, 32, 44, 64])[rng.integers(4, size=b64_rows.size)]
+        values[b64_rows] = self._random_base64_batch(b64_lengths.tolist())
+        values[uuid_rows] = _join_fixed(
+            self._random_hex_blob(32 * uuid_rows.size), uuid_rows.size, (8, 4, 4, 4, 12), '-'
+        )
+        return values.tolist()
+
+    def _tracking_values(self, n) -> list:
+        """Analytics-style identifiers (GA, fbp, amplitude, ...), one format picked per row."""
+        rng = self._rng
+        formats = rng.integers(7, size=n).tolist()
+        ga_ids = rng.integers(100000000, 1000000000, size=n).tolist()
+        v1_ids = rng.integers(10000, 100000, size=n).tolist()
+        pairs = rng.integers(1000000, 10000000, size=(n, 2)).tolist()
+        hex16 = iter(self._random_hex_batch([16] * formats.count(2)))
+        hex12 = iter(self._random_hex_batch([12] * formats.count(3)))
+        amp = iter(self._random_base64_batch([22] * formats.count(4)))
+        now = int(self._now_ts)
+
+        values = []
+        for i, fmt in enumerate(formats):
+            if fmt == 0:
+                values.append(f"GA1.2.{ga_ids[i]}.{now}")
+            elif fmt == 1:
+                values.append(f"GA1.3.{ga_ids[i]}.{now}")
+            elif fmt == 2:
+                values.append(next(hex16))
+            elif fmt == 3:
+                values.append(f"v1.{v1_ids[i]}.{next(hex12)}")
+            elif fmt == 4:
+                values.append(f"amp-{next(amp)}")
+            elif fmt == 5:
+                values.append(f"{pairs[i][0]}.{pairs[i][1]}")
+            else:
+                values.append(f"fb.1.{now}.{ga_ids[i]}")
+        return values
+
+    def _random_values(self, n) -> list:
+        lengths = np.array([4, 8, 12, 16, 24])[self._rng.integers(5, size=n)]
+        return self._random_hex_batch(lengths.tolist())
+
+    def _random_hex_batch(self, lengths) -> list:
+        return _split(self._random_hex_blob(sum(lengths)), lengths)
+
+    def _random_base64_batch(self, lengths) -> list:
+        return _split(self._random_base64_blob(sum(lengths)), lengths)
+
+    def _random_hex_blob(self, total) -> str:
+        # Two hex digits per random byte, encoded in C by bytes.hex()
+        return self._rng.bytes((total + 1) // 2).hex()
+
+    def _random_base64_blob(self, total) -> str:
+        # Whole 3-byte groups encode to uniform base64url characters with no padding
+        groups = (total + 3) // 4
+        return base64.urlsafe_b64encode(self._rng.bytes(3 * groups)).decode('ascii')
 
     def generate_dataset(self, n_samples: int = 5000) -> list:
         """
@@ -353,38 +590,94 @@ class TrainingDataGenerator:
         """
         samples_per_class = n_samples // 4
         dataset = []
-        for _ in range(samples_per_class):
-            diff = 'hard' if random.random() < 0.40 else 'normal'
-            dataset.append(self.generate_auth_cookie(difficulty=diff))
-            diff = 'hard' if random.random() < 0.40 else 'normal'
-            dataset.append(self.generate_tracking_cookie(difficulty=diff))
-            dataset.append(self.generate_preference_cookie())
-            diff = 'hard' if random.random() < 0.40 else 'normal'
-            dataset.append(self.generate_other_cookie(difficulty=diff))
-        random.shuffle(dataset)
-        return dataset
+        for label in self.LABELS:
+            dataset.extend(self._generate_class_batch(label, samples_per_class))
+        return [dataset[i] for i in self._rng.permutation(len(dataset)).tolist()]
+
+    def generate_dataset_columns(self, n_samples: int = 5000) -> Dict[str, np.ndarray]:
+        """
+        Columnar (struct-of-arrays) variant of generate_dataset.
+
+        Returns one array per cookie field with rows shuffled together, for
+        callers that want typed columns instead of n_samples dicts:
+        secure/httpOnly/hostOnly are bool, behavior flags int8, and
+        expirationDate is int64 with -1 marking session cookies. Text
+        fields (and sameSite, which may be None) are object arrays.
+        """
+        per_class = n_samples // 4
+        parts = [(label, self._class_columns(label, per_class)) for label in self.LABELS]
+        order = self._rng.permutation(per_class * 4)
+
+        columns = {}
+        for key, dtype in _COLUMN_DTYPES.items():
+            if key == 'label':
+                values = [label for label, _ in parts for _ in range(per_class)]
+            else:
+                values = [v for _, cols in parts for v in cols[key]]
+            if key == 'expirationDate':
+                values = [-1 if v is None else v for v in values]
+            column = np.empty(len(values), dtype=dtype)
+            column[:] = values
+            columns[key] = column[order]
+        return columns
+
+    def generate_dataset_parallel(self, n_samples: int = 5000, workers: int = None) -> list:
+        """
+        generate_dataset() fanned out over worker processes.
+
+        Each worker runs on a child Generator spawned from this one (an
+        independent SeedSequence stream), so a seeded generator stays
+        reproducible for a fixed worker count. All shards share this
+        generator's reference timestamp.
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            return self.generate_dataset(n_samples)
+        per_class = n_samples // 4
+        shares = [per_class // workers + (i < per_class % workers) for i in range(workers)]
+        children = self._rng.spawn(workers)
+        jobs = [(child, self._now_ts, share) for child, share in zip(children, shares) if share]
+
+        with ProcessPoolExecutor(max_workers=len(jobs) or 1) as pool:
+            dataset = [c for shard in pool.map(_generate_shard, jobs) for c in shard]
+        return [dataset[i] for i in self._rng.permutation(len(dataset)).tolist()]
+
+
+def _generate_shard(job) -> list:
+    """Worker entry point for generate_dataset_parallel: (rng, now_ts, per_class) -> cookies."""
+    rng, now_ts, per_class = job
+    generator = TrainingDataGenerator(seed=rng)
+    generator._now_ts = now_ts
+    return generator.generate_dataset(n_samples=per_class * 4)
 
 
 if __name__ == "__main__":
-    random.seed(42)
-    generator = TrainingDataGenerator()
+    generator = TrainingDataGenerator(seed=42)
     dataset = generator.generate_dataset(n_samples=5000)
 
     output_path = '/home/claude/cookieguard-ai/data/training_cookies.json'
-    import os; os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    with open(output_path, 'w') as f:
-        json.dump(dataset, f, indent=2)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    write_dataset(dataset, output_path)
 
     print(f"Generated {len(dataset)} training samples")
     print(f"Sites: {len(set(c['site_id'] for c in dataset))}")
 
-    for label in ['authentication', 'tracking', 'preference', 'other']:
-        subset = [c for c in dataset if c['label'] == label]
-        avg_changed = sum(c['changed_during_login'] for c in subset) / len(subset)
-        avg_new = sum(c['new_after_login'] for c in subset) / len(subset)
-        avg_rotated = sum(c['rotated_after_login'] for c in subset) / len(subset)
-        avg_3p = sum(c['third_party'] for c in subset) / len(subset)
-        print(f"\n{label.upper()} (n={len(subset)}):")
+    # One pass: [count, changed, new, rotated, third_party] per label
+    stats = {label: [0, 0, 0, 0, 0] for label in TrainingDataGenerator.LABELS}
+    for c in dataset:
+        s = stats[c['label']]
+        s[0] += 1
+        s[1] += c['changed_during_login']
+        s[2] += c['new_after_login']
+        s[3] += c['rotated_after_login']
+        s[4] += c['third_party']
+
+    for label, (n, changed, new, rotated, third_party) in stats.items():
+        avg_changed = changed / n
+        avg_new = new / n
+        avg_rotated = rotated / n
+        avg_3p = third_party / n
+        print(f"\n{label.upper()} (n={n}):")
         print(f"  changed_during_login: {avg_changed:.0%}")
         print(f"  new_after_login:      {avg_new:.0%}")
         print(f"  rotated_after_login:  {avg_rotated:.0%}")
@@ -3,10 +3,22 @@ Enhanced Risk Scorer with Improved Formula
 RiskScore = P(auth) × Severity(flags) × Exposure(scope)
 """
 
+import time
+import numpy as np
+from bisect import bisect_right
 from typing import Dict, List
 from datetime import datetime
 
 
+_TRUE_STRS = frozenset(('true','1','yes','y','✓','✓ yes','on'))
+_FALSE_STRS = frozenset(('false','0','no','n','✗','✗ no','off'))
+# Lowercased sameSite values that leave the cookie sendable cross-site
+_SAMESITE_BAD = frozenset(('', 'none', 'no_restriction'))
+# Accepted spellings of each flag key, in lookup priority order
+_HTTPONLY_KEYS = ('httpOnly', 'HttpOnly', 'httponly', 'http_only')
+_SECURE_KEYS = ('secure', 'Secure')
+
+
 def _coerce_bool(v):
     """Coerce common cookie flag representations to bool."""
     if v is None:
@@ -17,207 +29,426 @@ def _coerce_bool(v):
         return bool(v)
     if isinstance(v, str):
         s = v.strip().lower()
-        if s in ('true','1','yes','y','✓','✓ yes','on'):
+        if s in _TRUE_STRS:
             return True
-        if s in ('false','0','no','n','✗','✗ no','off'):
+        if s in _FALSE_STRS:
             return False
     # Fallback: Python truthiness (avoid raising)
     return bool(v)
 
-def _get_flag(cookie: dict, *keys, default=None):
-    """Get a boolean-ish flag from cookie using multiple possible keys."""
+def _get_flag(cookie: dict, keys: tuple, default=None):
+    """Get a boolean-ish flag from cookie; `keys` lists the accepted spellings, first match wins."""
     for k in keys:
         if k in cookie:
-            return _coerce_bool(cookie.get(k))
+            return _coerce_bool(cookie[k])
     return default
 
+def _resolve_flags(cookie: dict):
+    """(secure, httpOnly) as reported in cookie_attributes; resolved once per cookie and reused for scoring."""
+    return _get_flag(cookie, _SECURE_KEYS, False), _get_flag(cookie, _HTTPONLY_KEYS, False)
+
+_LOCAL_HOSTS = ('localhost', '127.0.0.1')
+
+
+def _score_columns(httponly, secure, samesite_bad, wildcard, host_violation, non_host_only,
+                   shared_name, broad_path, has_expiry, days):
+    """
+    Fused per-row score loop for analyze_cookies (compiled by _get_score_kernel).
+
+    Takes the already-resolved scope masks (the precedence chain is applied
+    by the caller) and returns int(points × breadth × lifetime) per row,
+    matching the NumPy expression bit for bit.
+    """
+    n = httponly.shape[0]
+    out = np.empty(n, np.int64)
+    for i in range(n):
+        points = 0
+        if not httponly[i]:
+            points += 40
+        if not secure[i]:
+            points += 25
+        if samesite_bad[i]:
+            points += 20
+        breadth = 1.0
+        if wildcard[i]:
+            points += 15
+            breadth = 1.5
+        elif host_violation[i]:
+            points += 20
+            breadth = 1.3
+        elif non_host_only[i]:
+            points += 6
+            breadth = 1.15
+        elif shared_name[i]:
+            points += 4
+            breadth = 1.05
+        if broad_path[i]:
+            points += 5
+        lifetime = 1.0
+        if has_expiry[i]:
+            d = days[i]
+            if d > 30:
+                points += 10
+            elif d > 7:
+                points += 5
+            elif d >= 3:
+                points += 3
+            lifetime = 1.0 + min(d / 365.0, 1.0)
+        out[i] = int(points * (breadth * lifetime))
+    return out
+
+
+# njit-compiled _score_columns: None until the first batch asks for it,
+# False when numba is unavailable. Compiling lazily keeps numba out of
+# import time for callers (app.py) that only score one cookie at a time.
+_score_kernel = None
+
+
+def _get_score_kernel():
+    """The compiled _score_columns, built on first use; None without numba."""
+    global _score_kernel
+    if _score_kernel is None:
+        try:
+            from numba import njit
+        except ImportError:  # numba is optional; batch scores fall back to NumPy masks
+            _score_kernel = False
+        else:
+            _score_kernel = njit(cache=True)(_score_columns)
+    return _score_kernel or None
+
+
+_SECONDS_PER_DAY = 86400
+
+
+def _summary_templates(type_descriptions, risk_labels):
+    """(severity, ml_type) → (no-issue, with-issues) %-templates for the result summary."""
+    table = {}
+    for sev, label in risk_labels.items():
+        label = label.replace('%', '%%')
+        for ml_type, desc in type_descriptions.items():
+            desc = desc.replace('%', '%%')
+            # %.0f%% of confidence*100 renders exactly like f'{confidence:.0%}'
+            table[sev, ml_type] = (f"Cookie '%s' {desc}. {label}.",
+                                   f"Cookie '%s' likely {desc} (AI: %.0f%%). {label}. Found %d issue(s).")
+    return table
+
+
+def _days_until(expiry, now: float) -> int:
+    """Whole days from `now` (epoch seconds) until an epoch-seconds or ISO-8601 expiry, floored at 0."""
+    # Numeric expiries (the common case) stay in float arithmetic; only strings are parsed
+    expiry_ts = expiry if isinstance(expiry, (int, float)) else datetime.fromisoformat(str(expiry)).timestamp()
+    return max(int((expiry_ts - now) // _SECONDS_PER_DAY), 0)
+
+
 class RiskScorer:
+    __slots__ = ()  # stateless; all tables are class-level
+
     CRITICAL, HIGH, MEDIUM, LOW, INFO = "critical", "high", "medium", "low", "info"
 
-    def analyze_cookie(self, cookie, ml_type, ml_confidence, ml_probabilities, site_host: str | None = None):
-        issues, recommendations, risk_score = [], [], 0
-        is_auth = ml_type=='authentication' or ml_probabilities.get('authentication',0)>0.3
+    # Issue kind → (severity, title, description, impact, recommendation).
+    # Descriptions may carry {domain}/{days} fields filled in per cookie.
+    ISSUES = {
+        'httponly': (CRITICAL, 'Missing HttpOnly Flag',
+                     'Cookie accessible via JavaScript - vulnerable to XSS attacks that can steal session tokens',
+                     'Account takeover via cross-site scripting (XSS)',
+                     'This site left your login cookie exposed to JavaScript. Consider using a browser extension that blocks inline scripts, and avoid entering credentials on this site over untrusted networks.'),
+        'secure': (HIGH, 'Missing Secure Flag',
+                   'Cookie sent over HTTP - vulnerable to network interception',
+                   'Session token exposure on unsecured connections',
+                   'Your session cookie can be sent over unencrypted HTTP. Avoid using this site on public WiFi. Consider a VPN, or use HTTPS Everywhere / browser HTTPS-only mode.'),
+        'samesite': (HIGH, 'Missing SameSite Protection',
+                     'Cookie sent with cross-site requests - vulnerable to CSRF attacks',
+                     'Unauthorized actions via cross-site request forgery',
+                     'This cookie is sent on cross-site requests, making CSRF attacks possible. Be cautious clicking links from untrusted sources while logged in to this site.'),
+        'wildcard': (MEDIUM, 'Wildcard Domain - Subdomain Takeover Risk',
+                     'Cookie accessible to all subdomains of {domain}. If attacker controls ANY subdomain, they can steal this cookie.',
+                     'Session hijacking via compromised subdomain',
+                     'This cookie is shared across all subdomains — if any subdomain is compromised, your session could be stolen. Log out after each session and clear cookies regularly.'),
+        'host_prefix': (HIGH, '__Host- prefix requires host-only cookie',
+                        '__Host- cookies must NOT set Domain (hostOnly must be true).',
+                        'Prefix contract violated; increases cookie scope',
+                        'This cookie uses the __Host- prefix but has an incorrect configuration. The site may have a security misconfiguration — consider reporting it to their security team.'),
+        'host_unverified': (INFO, '__Host- compliance not verifiable',
+                            'Cookie name uses __Host- prefix, but hostOnly flag was not provided by the collector. Include hostOnly to verify compliance.',
+                            'Unable to assess prefix requirements',
+                            None),
+        'non_host_only': (LOW, 'Non-host-only Domain Scope',
+                          'Cookie appears to be set with a Domain attribute ({domain}). This can be intentional, but is broader than host-only.',
+                          'Potential cross-subdomain cookie access',
+                          'This cookie has broader domain scope than necessary. Be aware it may be readable from other subdomains of this site.'),
+        'shared_name': (LOW, 'Shared Cookie Naming',
+                        'Cookie name suggests it may be shared across subdomains.',
+                        'Slightly increased attack surface',
+                        None),
+        'broad_path': (LOW, 'Broad Path Scope',
+                       'Cookie accessible to all paths on domain. Consider limiting to specific paths like /api or /app.',
+                       'Increased exposure surface',
+                       'This cookie is accessible on all paths of the site, increasing its exposure. Clear cookies after sensitive sessions.'),
+        'long_lived': (MEDIUM, 'Long-Lived Session Cookie',
+                       'Cookie expires in {days} days. Extended lifetime increases window for session replay attacks.',
+                       'Extended exposure window for stolen tokens',
+                       'This login cookie has a long lifetime, increasing risk if stolen. Log out manually when done and consider clearing cookies periodically.'),
+        'moderate_lifetime': (LOW, 'Moderate Session Lifetime',
+                              'Cookie expires in {days} days. Consider shorter lifetime for sensitive sessions.',
+                              'Moderate exposure window',
+                              'This session cookie lasts several days. Log out after use on shared devices.'),
+        'multi_day': (LOW, 'Multi-Day Session',
+                      'Cookie expires in {days} days',
+                      'Extended session window',
+                      None),
+    }
+
+    # Issue dicts are built once and shared by every result (consumers only read them);
+    # kinds with a {domain}/{days} field get a per-cookie copy with the description filled in.
+    _ISSUE_DICTS = {kind: {'severity': severity, 'title': title, 'description': description, 'impact': impact}
+                    for kind, (severity, title, description, impact, _) in ISSUES.items()}
+    _TEMPLATED_ISSUES = frozenset(kind for kind, entry in ISSUES.items() if '{' in entry[2])
+
+    TYPE_DESCRIPTIONS = {'authentication': 'keeps you logged in', 'tracking': 'tracks activity',
+                         'preference': 'stores preferences', 'other': 'serves functional purpose'}
+
+    RISK_LABELS = {
+        CRITICAL: 'CRITICAL - account takeover possible',
+        HIGH: 'HIGH RISK - significant exposure',
+        MEDIUM: 'MEDIUM RISK - some concerns',
+        LOW: 'LOW RISK - minor improvements possible',
+        INFO: 'No significant concerns'
+    }
+
+    _SUMMARY_TEMPLATES = _summary_templates(TYPE_DESCRIPTIONS, RISK_LABELS)
+
+    # Overall severity by score: bisect_right(thresholds, score) indexes the band
+    #   0 → INFO, 1-14 → LOW, 15-29 → MEDIUM, 30-49 → HIGH, ≥ 50 → CRITICAL
+    _SEVERITY_THRESHOLDS = (1, 15, 30, 50)
+    _SEVERITY_BANDS = (INFO, LOW, MEDIUM, HIGH, CRITICAL)
+
+    def analyze_cookie(self, cookie, ml_type, ml_confidence, ml_probabilities, site_host: str | None = None,
+                       now: float | None = None):
+        """
+        Score one cookie. `now` (epoch seconds) is the reference time for the
+        lifetime checks; callers scoring many cookies pass one value for all.
+        """
+        secure, httponly = _resolve_flags(cookie)
+        if not (ml_type=='authentication' or ml_probabilities.get('authentication',0)>0.3):
+            # Severity checks only apply to likely auth cookies
+            return self._nonauth_result(cookie, ml_type, ml_confidence, ml_probabilities, secure, httponly)
 
         # Severity analysis
-        if is_auth:
-            if not _get_flag(cookie, 'httpOnly', 'HttpOnly', 'httponly', 'http_only', default=False):
-                issues.append({'severity':self.CRITICAL, 'title':'Missing HttpOnly Flag',
-                               'description':'Cookie accessible via JavaScript - vulnerable to XSS attacks that can steal session tokens',
-                               'impact':'Account takeover via cross-site scripting (XSS)'})
-                risk_score += 40
-                recommendations.append('This site left your login cookie exposed to JavaScript. Consider using a browser extension that blocks inline scripts, and avoid entering credentials on this site over untrusted networks.')
-
-            if not _get_flag(cookie, 'secure', 'Secure', default=False):
-                issues.append({'severity':self.HIGH, 'title':'Missing Secure Flag',
-                               'description':'Cookie sent over HTTP - vulnerable to network interception',
-                               'impact':'Session token exposure on unsecured connections'})
-                risk_score += 25
-                recommendations.append('Your session cookie can be sent over unencrypted HTTP. Avoid using this site on public WiFi. Consider a VPN, or use HTTPS Everywhere / browser HTTPS-only mode.')
-
-            samesite = (cookie.get('sameSite','') or '').lower()
-            if not samesite or samesite in ('none','no_restriction'):
-                issues.append({'severity':self.HIGH, 'title':'Missing SameSite Protection',
-                               'description':'Cookie sent with cross-site requests - vulnerable to CSRF attacks',
-                               'impact':'Unauthorized actions via cross-site request forgery'})
-                risk_score += 20
-                recommendations.append('This cookie is sent on cross-site requests, making CSRF attacks possible. Be cautious clicking links from untrusted sources while logged in to this site.')
-            elif samesite=='lax':
-                # Only flag if other issues present
-                pass
-
-            # Exposure multiplier and domain/path analysis
-            domain = cookie.get('domain','')
-            path = cookie.get('path', '/')
-            expiry = cookie.get('expirationDate')
-            name = cookie.get('name', '')
-
-            # Subdomain/scope risk detection
-            has_scope_issue = False
-
-            # Determine host-only vs Domain attribute
-            host_only = cookie.get('hostOnly')
-            # Some collectors may omit hostOnly; treat as unknown (None)
-            host_only = None if host_only is None else bool(host_only)
-
-            is_host_prefix = name.startswith('__Host-')
-
-            # Check for wildcard domain (Domain=.example.com)
-            if domain and domain.startswith('.'):
-                issues.append({'severity':self.MEDIUM, 'title':'Wildcard Domain - Subdomain Takeover Risk',
-                               'description':f'Cookie accessible to all subdomains of {domain[1:]}. If attacker controls ANY subdomain, they can steal this cookie.',
-                               'impact':'Session hijacking via compromised subdomain'})
-                risk_score += 15
-                recommendations.append('This cookie is shared across all subdomains — if any subdomain is compromised, your session could be stolen. Log out after each session and clear cookies regularly.')
-                has_scope_issue = True
-                breadth_factor = 1.5
-
-            # __Host- cookies MUST be host-only; only flag if we can verify hostOnly==False
-            elif is_host_prefix:
-                if host_only is False:
-                    issues.append({'severity':self.HIGH, 'title':'__Host- prefix requires host-only cookie',
-                                   'description':'__Host- cookies must NOT set Domain (hostOnly must be true).',
-                                   'impact':'Prefix contract violated; increases cookie scope'})
-                    risk_score += 20
-                    recommendations.append('This cookie uses the __Host- prefix but has an incorrect configuration. The site may have a security misconfiguration — consider reporting it to their security team.')
-                    has_scope_issue = True
-                    breadth_factor = 1.3
-                elif host_only is None:
-                    # Don’t call it a misconfig if we cannot verify
-                    issues.append({'severity':self.INFO, 'title':'__Host- compliance not verifiable',
-                                   'description':'Cookie name uses __Host- prefix, but hostOnly flag was not provided by the collector. Include hostOnly to verify compliance.',
-                                   'impact':'Unable to assess prefix requirements'})
-                    breadth_factor = 1.0
-                else:
-                    breadth_factor = 1.0
-
-            # Explicit Domain attribute (hostOnly == False) can broaden scope, but domain equal to the site host is low concern
-            elif host_only is False and domain and domain not in ('localhost','127.0.0.1'):
-                # If domain equals the scanned host, it is effectively not broader than the current site
-                if site_host and domain == site_host:
-                    breadth_factor = 1.0
-                else:
-                    issues.append({'severity':self.LOW, 'title':'Non-host-only Domain Scope',
-                                   'description':f'Cookie appears to be set with a Domain attribute ({domain}). This can be intentional, but is broader than host-only.',
-                                   'impact':'Potential cross-subdomain cookie access'})
-                    risk_score += 6
-                    recommendations.append('This cookie has broader domain scope than necessary. Be aware it may be readable from other subdomains of this site.')
-                    has_scope_issue = True
-                    breadth_factor = 1.15
-
-            # Shared/global naming heuristic (weak signal)
-            elif 'shared' in name.lower() or 'global' in name.lower():
-                issues.append({'severity':self.LOW, 'title':'Shared Cookie Naming',
-                               'description':'Cookie name suggests it may be shared across subdomains.',
-                               'impact':'Slightly increased attack surface'})
-                risk_score += 4
-                has_scope_issue = True
-                breadth_factor = 1.05
-            else:
-                breadth_factor = 1.0
-
-            # Broad path scope
-            if path == '/' and has_scope_issue and not name.startswith('__Host-'):
-                issues.append({'severity':self.LOW, 'title':'Broad Path Scope',
-                               'description':'Cookie accessible to all paths on domain. Consider limiting to specific paths like /api or /app.',
-                               'impact':'Increased exposure surface'})
-                risk_score += 5
-                recommendations.append('This cookie is accessible on all paths of the site, increasing its exposure. Clear cookies after sensitive sessions.')
-
-            # Lifetime factor
-            if expiry:
-                dt = datetime.fromtimestamp(expiry) if isinstance(expiry,(int,float)) else datetime.fromisoformat(str(expiry))
-                days = max((dt - datetime.now()).days, 0)
-                if days > 30:
-                    issues.append({'severity':self.MEDIUM, 'title':'Long-Lived Session Cookie',
-                                   'description':f'Cookie expires in {days} days. Extended lifetime increases window for session replay attacks.',
-                                   'impact':'Extended exposure window for stolen tokens'})
-                    risk_score += 10
-                    recommendations.append('This login cookie has a long lifetime, increasing risk if stolen. Log out manually when done and consider clearing cookies periodically.')
-                elif days > 7:
-                    issues.append({'severity':self.LOW, 'title':'Moderate Session Lifetime',
-                                   'description':f'Cookie expires in {days} days. Consider shorter lifetime for sensitive sessions.',
-                                   'impact':'Moderate exposure window'})
-                    risk_score += 5
-                    recommendations.append('This session cookie lasts several days. Log out after use on shared devices.')
-                elif days >= 3:
-                    issues.append({'severity':self.LOW, 'title':'Multi-Day Session',
-                                   'description':f'Cookie expires in {days} days',
-                                   'impact':'Extended session window'})
-                    risk_score += 3
-                lifetime_factor = 1.0 + min(days/365.0, 1.0)
+        missing_httponly = not httponly
+        missing_secure = not secure
+        samesite_bad = (cookie.get('sameSite','') or '').lower() in _SAMESITE_BAD
+
+        # Exposure multiplier and domain/path analysis
+        domain = cookie.get('domain','')
+        path = cookie.get('path', '/')
+        expiry = cookie.get('expirationDate')
+        name = cookie.get('name', '')
+
+        # Determine host-only vs Domain attribute
+        host_only = cookie.get('hostOnly')
+        # Some collectors may omit hostOnly; treat as unknown (None)
+        host_only = None if host_only is None else bool(host_only)
+
+        # Lowered once; the __Host- prefix is matched case-insensitively, as in the feature extractor
+        name_lower = name.lower()
+        is_host_prefix = name_lower.startswith('__host-')
+
+        # Scope checks form a precedence chain; at most one of these holds.
+        # Wildcard domain (Domain=.example.com) comes first.
+        wildcard = bool(domain) and domain.startswith('.')
+        prefixed = is_host_prefix and not wildcard
+        # __Host- cookies MUST be host-only; only flag if we can verify hostOnly==False
+        host_violation = prefixed and host_only is False
+        # Don’t call it a misconfig if we cannot verify
+        host_unverified = prefixed and host_only is None
+        # Explicit Domain attribute (hostOnly == False) can broaden scope, but domain equal to the site host is low concern
+        explicit_domain = (not wildcard and not is_host_prefix and host_only is False
+                           and bool(domain) and domain not in _LOCAL_HOSTS)
+        non_host_only = explicit_domain and not (site_host and domain == site_host)
+        # Shared/global naming heuristic (weak signal)
+        shared_name = (not wildcard and not is_host_prefix and not explicit_domain
+                       and ('shared' in name_lower or 'global' in name_lower))
+        has_scope_issue = wildcard or host_violation or non_host_only or shared_name
+
+        # Broad path scope
+        broad_path = path == '/' and has_scope_issue and not is_host_prefix
+
+        # Lifetime tiers
+        days = _days_until(expiry, time.time() if now is None else now) if expiry else 0
+        long_lived = bool(expiry) and days > 30
+        moderate = bool(expiry) and 7 < days <= 30
+        multi_day = bool(expiry) and 3 <= days <= 7
+
+        # Straight-line sum of 0/1 terms; the issue list below is the only branchy part
+        risk_score = (40 * missing_httponly + 25 * missing_secure + 20 * samesite_bad
+                      + 15 * wildcard + 20 * host_violation + 6 * non_host_only + 4 * shared_name
+                      + 5 * broad_path + 10 * long_lived + 5 * moderate + 3 * multi_day)
+
+        issues, recommendations = [], []
+        for kind, hit in (('httponly', missing_httponly), ('secure', missing_secure),
+                          ('samesite', samesite_bad), ('wildcard', wildcard),
+                          ('host_prefix', host_violation), ('host_unverified', host_unverified),
+                          ('non_host_only', non_host_only), ('shared_name', shared_name),
+                          ('broad_path', broad_path), ('long_lived', long_lived),
+                          ('moderate_lifetime', moderate), ('multi_day', multi_day)):
+            if hit:
+                self._add_issue(issues, recommendations, kind,
+                                domain=domain[1:] if wildcard else domain, days=days)
+
+        # Apply exposure multiplier
+        breadth_factor = (1.5 if wildcard else 1.3 if host_violation else 1.15 if non_host_only
+                          else 1.05 if shared_name else 1.0)
+        lifetime_factor = 1.0 + min(days/365.0, 1.0) if expiry else 1.0
+        exposure = breadth_factor * lifetime_factor
+        risk_score = int(risk_score * exposure)
+
+        return self._build_result(cookie, ml_type, ml_confidence, ml_probabilities,
+                                  risk_score, issues, recommendations, secure, httponly)
+
+    def analyze_cookies(self, cookies, ml_types, ml_confidences, ml_probabilities, site_host: str | None = None,
+                        now: float | None = None):
+        """
+        Batch form of analyze_cookie over parallel per-cookie sequences.
+
+        The auth rows are gathered into flag columns once and the score is
+        computed with masked adds; issue dicts are only built for the rows
+        each mask selects. `now` (epoch seconds) is the lifetime reference
+        for every row, defaulting to the current time.
+        """
+        n = len(cookies)
+        scores = np.zeros(n, dtype=np.int64)
+        issues = [[] for _ in range(n)]
+        recommendations = [[] for _ in range(n)]
+
+        auth_prob = np.fromiter((p.get('authentication', 0) for p in ml_probabilities), float, n)
+        is_auth = np.fromiter((t == 'authentication' for t in ml_types), bool, n) | (auth_prob > 0.3)
+        rows = np.flatnonzero(is_auth)
+        flags = [_resolve_flags(c) for c in cookies]
+
+        if rows.size:
+            auth = [cookies[i] for i in rows]
+            m = len(auth)
+            secure = np.fromiter((bool(flags[i][0]) for i in rows), bool, m)
+            httponly = np.fromiter((bool(flags[i][1]) for i in rows), bool, m)
+            samesite_bad = np.fromiter(((c.get('sameSite', '') or '').lower() in _SAMESITE_BAD for c in auth), bool, m)
+            domains = [c.get('domain', '') or '' for c in auth]
+            domain = np.array(domains)
+            name = np.array([c.get('name', '') or '' for c in auth])
+            root_path = np.fromiter((c.get('path', '/') == '/' for c in auth), bool, m)
+            host_only = [c.get('hostOnly') for c in auth]
+            host_only_false = np.fromiter((h is not None and not h for h in host_only), bool, m)
+            host_only_none = np.fromiter((h is None for h in host_only), bool, m)
+
+            if now is None:
+                now = time.time()  # one reference time for the whole batch
+            expiries = [c.get('expirationDate') for c in auth]
+            has_expiry = np.fromiter((bool(e) for e in expiries), bool, m)
+            days = np.fromiter((_days_until(e, now) if e else 0 for e in expiries), np.int64, m)
+
+            # Scope checks form a precedence chain; each mask excludes the earlier ones
+            wildcard = np.char.startswith(domain, '.')
+            lowered = np.char.lower(name)
+            host_prefix = np.char.startswith(lowered, '__host-')
+            prefixed = host_prefix & ~wildcard
+            host_violation = prefixed & host_only_false
+            host_unverified = prefixed & host_only_none
+            unprefixed = ~wildcard & ~host_prefix
+            explicit_domain = unprefixed & host_only_false & (domain != '') & ~np.isin(domain, _LOCAL_HOSTS)
+            same_host = (domain == site_host) if site_host else np.zeros(m, dtype=bool)
+            non_host_only = explicit_domain & ~same_host
+            shared_name = (unprefixed & ~explicit_domain
+                           & ((np.char.find(lowered, 'shared') >= 0) | (np.char.find(lowered, 'global') >= 0)))
+            broad_path = root_path & (wildcard | host_violation | non_host_only | shared_name) & ~host_prefix
+            long_lived = has_expiry & (days > 30)
+            moderate = has_expiry & (days > 7) & (days <= 30)
+            multi_day = has_expiry & (days >= 3) & (days <= 7)
+
+            kernel = _get_score_kernel()
+            if kernel is not None:
+                scores[rows] = kernel(httponly, secure, samesite_bad, wildcard, host_violation,
+                                      non_host_only, shared_name, broad_path, has_expiry, days)
             else:
-                lifetime_factor = 1.0
+                points = (40 * ~httponly + 25 * ~secure + 20 * samesite_bad
+                          + 15 * wildcard + 20 * host_violation + 6 * non_host_only + 4 * shared_name
+                          + 5 * broad_path + 10 * long_lived + 5 * moderate + 3 * multi_day)
+                breadth = np.select([wildcard, host_violation, non_host_only, shared_name],
+                                    [1.5, 1.3, 1.15, 1.05], 1.0)
+                lifetime = np.where(has_expiry, 1.0 + np.minimum(days / 365.0, 1.0), 1.0)
+                scores[rows] = (points * (breadth * lifetime)).astype(np.int64)
 
-            # Apply exposure multiplier
-            exposure = breadth_factor * lifetime_factor
-            risk_score = int(risk_score * exposure)
+            # Masks are visited in report order, so each row's issues keep the scalar ordering
+            for kind, mask in (('httponly', ~httponly), ('secure', ~secure), ('samesite', samesite_bad),
+                               ('wildcard', wildcard), ('host_prefix', host_violation),
+                               ('host_unverified', host_unverified), ('non_host_only', non_host_only),
+                               ('shared_name', shared_name), ('broad_path', broad_path),
+                               ('long_lived', long_lived), ('moderate_lifetime', moderate),
+                               ('multi_day', multi_day)):
+                for j in np.flatnonzero(mask):
+                    i = rows[j]
+                    self._add_issue(issues[i], recommendations[i], kind,
+                                    domain=domains[j][1:] if kind == 'wildcard' else domains[j],
+                                    days=int(days[j]))
 
+        return [self._build_result(c, t, conf, p, score, iss, recs, *flag) if auth
+                else self._nonauth_result(c, t, conf, p, *flag)
+                for c, t, conf, p, score, iss, recs, flag, auth in zip(
+                    cookies, ml_types, ml_confidences, ml_probabilities,
+                    scores.tolist(), issues, recommendations, flags, is_auth.tolist())]
+
+    def _add_issue(self, issues, recommendations, kind, **fields):
+        issue = self._ISSUE_DICTS[kind]
+        if kind in self._TEMPLATED_ISSUES:
+            issue = {**issue, 'description': issue['description'].format(**fields)}
+        issues.append(issue)
+        recommendation = self.ISSUES[kind][4]
+        if recommendation:
+            recommendations.append(recommendation)
+
+    def _build_result(self, cookie, ml_type, ml_confidence, ml_probabilities, risk_score, issues, recommendations,
+                      secure, httponly):
         # Overall severity
-        if risk_score >= 50:
-            overall_severity = self.CRITICAL
-        elif risk_score >= 30:
-            overall_severity = self.HIGH
-        elif risk_score >= 15:
-            overall_severity = self.MEDIUM
-        elif risk_score > 0:
-            overall_severity = self.LOW
-        else:
-            overall_severity = self.INFO
+        overall_severity = self._SEVERITY_BANDS[bisect_right(self._SEVERITY_THRESHOLDS, risk_score)]
 
         # Generate summary
         name = cookie.get('name','Unknown')
-        type_desc = {'authentication':'keeps you logged in', 'tracking':'tracks activity',
-                     'preference':'stores preferences', 'other':'serves functional purpose'}[ml_type]
-
-        risk_map = {
-            self.CRITICAL: 'CRITICAL - account takeover possible',
-            self.HIGH: 'HIGH RISK - significant exposure',
-            self.MEDIUM: 'MEDIUM RISK - some concerns',
-            self.LOW: 'LOW RISK - minor improvements possible',
-            self.INFO: 'No significant concerns'
-        }
+        no_issue, with_issues = self._SUMMARY_TEMPLATES[overall_severity, ml_type]
+        summary = with_issues % (name, ml_confidence * 100, len(issues)) if issues else no_issue % (name,)
+
+        return self._payload(cookie, name, ml_type, ml_confidence, ml_probabilities, overall_severity, risk_score,
+                             issues, recommendations, summary, secure, httponly)
 
-        summary = f"Cookie '{name}' likely {type_desc} (AI: {ml_confidence:.0%}). {risk_map[overall_severity]}. Found {len(issues)} issue(s)." if issues else f"Cookie '{name}' {type_desc}. {risk_map[overall_severity]}."
+    def _nonauth_result(self, cookie, ml_type, ml_confidence, ml_probabilities, secure, httponly):
+        """Result for a cookie that fails the auth gate: no checks run, so it is always INFO with no issues."""
+        name = cookie.get('name','Unknown')
+        summary = self._SUMMARY_TEMPLATES[self.INFO, ml_type][0] % (name,)
+        return self._payload(cookie, name, ml_type, ml_confidence, ml_probabilities, self.INFO, 0,
+                             [], [], summary, secure, httponly)
 
+    def _payload(self, cookie, name, ml_type, ml_confidence, ml_probabilities, severity, risk_score,
+                 issues, recommendations, summary, secure, httponly):
         return {
             'cookie_name': name,
             'cookie_domain': cookie.get('domain'),
             'cookie_attributes': {
                 'domain': cookie.get('domain'),
                 'path': cookie.get('path', '/'),
-                'secure': _get_flag(cookie, 'secure', 'Secure', default=False),
-                'httpOnly': _get_flag(cookie, 'httpOnly', 'HttpOnly', 'httponly', 'http_only', default=False),
+                'secure': secure,
+                'httpOnly': httponly,
                 'sameSite': cookie.get('sameSite'),
                 'expirationDate': cookie.get('expirationDate'),
                 'hostOnly': cookie.get('hostOnly')
             },
             'ml_classification': {'type':ml_type, 'confidence':ml_confidence, 'probabilities':ml_probabilities},
-            'risk_assessment': {'severity':overall_severity, 'score':risk_score, 'max_score':100},
+            'risk_assessment': {'severity':severity, 'score':risk_score, 'max_score':100},
             'issues': issues,
             'recommendations': recommendations,
             'summary': summary
         }
 
     def rank_cookies_by_risk(self, analyses):
-        return sorted(analyses, key=lambda x: (x['risk_assessment']['score'],
-                                               x['ml_classification']['probabilities'].get('authentication',0)), reverse=True)
\ No newline at end of file
+        # Descending by (score, P(auth)); lexsort is stable, so ties keep input order as sorted() did
+        n = len(analyses)
+        scores = np.fromiter((a['risk_assessment']['score'] for a in analyses), np.int64, n)
+        auth = np.fromiter((a['ml_classification']['probabilities'].get('authentication',0) for a in analyses),
+                           np.float64, n)
+        return [analyses[i] for i in np.lexsort((-auth, -scores))]
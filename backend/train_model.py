@@ -9,13 +9,13 @@ import numpy as np
 import sys
 from pathlib import Path
 
-from sklearn.model_selection import train_test_split, GroupKFold
+from sklearn.model_selection import train_test_split, GroupKFold, GroupShuffleSplit
 from sklearn.metrics import classification_report, accuracy_score
 
 sys.path.insert(0, str(Path(__file__).parent))
 from feature_extractor import CookieFeatureExtractor
 from classifier import CookieClassifier
-from generate_training_data import TrainingDataGenerator
+from generate_training_data import TrainingDataGenerator, read_dataset, write_dataset
 
 
 def train_model():
@@ -37,13 +37,11 @@ def train_model():
         print("\n[1/6] Generating training data with behavior features...")
         generator = TrainingDataGenerator()
         training_data = generator.generate_dataset(n_samples=1000)
-        with open(data_path, 'w') as f:
-            json.dump(training_data, f, indent=2)
+        write_dataset(training_data, data_path)
         print(f"      Generated {len(training_data)} samples")
     else:
         print("\n[1/6] Loading training data...")
-        with open(data_path, 'r') as f:
-            training_data = json.load(f)
+        training_data = read_dataset(data_path)
         print(f"      Loaded {len(training_data)} samples")
 
     # ──────────────────────────────────────────────────────────
@@ -54,15 +52,15 @@ def train_model():
     feature_names = extractor.get_feature_names()
     label_map = {'other': 0, 'authentication': 1, 'tracking': 2, 'preference': 3}
 
-    X, y, site_ids = [], [], []
-    for cookie in training_data:
-        features = extractor.extract_features(cookie)
-        X.append([features[n] for n in feature_names])
-        y.append(label_map[cookie['label']])
-        site_ids.append(cookie.get('site_id', 'unknown'))
-
-    X, y = np.array(X), np.array(y)
-    site_ids = np.array(site_ids)
+    # One pass straight into the (n_samples, 38) matrix; no per-cookie feature dicts.
+    # X is float64 because predict_from_dict serves float64 vectors; a float32
+    # training matrix rounds features differently and shifts probabilities.
+    X = extractor.extract_features_matrix(training_data, dtype=np.float64)
+    y = np.array([label_map[cookie['label']] for cookie in training_data], dtype=np.int32)
+    site_ids = np.array([cookie.get('site_id', 'unknown') for cookie in training_data])
+    # Factorize the site ids once; the split and the site listings below work on
+    # the integer codes instead of re-sorting the strings
+    site_names, site_codes = np.unique(site_ids, return_inverse=True)
 
     print(f"      Feature matrix: {X.shape}")
     print(f"      Feature groups: {list(extractor.get_feature_groups().keys())}")
@@ -73,30 +71,26 @@ def train_model():
     # Step 3: Group-holdout split by site_id
     # ──────────────────────────────────────────────────────────
     print("\n[3/6] Splitting with site-based group holdout...")
-    unique_sites = np.unique(site_ids)
-
-    # Hold out 2 sites for validation
-    np.random.seed(42)
-    holdout_sites = np.random.choice(unique_sites, size=min(2, len(unique_sites)), replace=False)
-    val_mask = np.isin(site_ids, holdout_sites)
-    train_mask = ~val_mask
+    # Hold out ~20% of sites for validation; indices come back in row order and
+    # are reused to gather X and y
+    (train_idx, val_idx), = GroupShuffleSplit(n_splits=1, test_size=0.2, random_state=42).split(
+        X, y, groups=site_codes
+    )
 
     # If holdout is too small, fall back to random split
-    if val_mask.sum() < 50:
+    if len(val_idx) < 50:
         print("      (Group holdout too small, falling back to random split)")
-        train_mask_idx, val_mask_idx = train_test_split(
+        train_idx, val_idx = train_test_split(
             np.arange(len(y)), test_size=0.2, random_state=42, stratify=y
         )
-        train_mask = np.zeros(len(y), dtype=bool)
-        val_mask = np.zeros(len(y), dtype=bool)
-        train_mask[train_mask_idx] = True
-        val_mask[val_mask_idx] = True
+        train_idx.sort()
+        val_idx.sort()
 
-    X_train, X_val = X[train_mask], X[val_mask]
-    y_train, y_val = y[train_mask], y[val_mask]
+    X_train, X_val = X.take(train_idx, axis=0), X.take(val_idx, axis=0)
+    y_train, y_val = y.take(train_idx), y.take(val_idx)
 
-    print(f"      Train: {len(X_train)} (sites: {np.unique(site_ids[train_mask])})")
-    print(f"      Val:   {len(X_val)} (sites: {np.unique(site_ids[val_mask])})")
+    print(f"      Train: {len(X_train)} (sites: {site_names[np.unique(site_codes[train_idx])]})")
+    print(f"      Val:   {len(X_val)} (sites: {site_names[np.unique(site_codes[val_idx])]})")
 
     # ──────────────────────────────────────────────────────────
     # Step 4: Multi-model benchmarking
@@ -139,8 +133,9 @@ def train_model():
     pred_val, _ = classifier.predict(X_val)
     
     labels = ['other', 'authentication', 'tracking', 'preference']
+    val_accuracy = float(accuracy_score(y_val, pred_val))
     print(f"\n  Training accuracy:   {accuracy_score(y_train, pred_train):.2%}")
-    print(f"  Validation accuracy: {accuracy_score(y_val, pred_val):.2%}")
+    print(f"  Validation accuracy: {val_accuracy:.2%}")
     print(f"\n  Classification Report (Validation):")
     print(classification_report(y_val, pred_val, target_names=labels, zero_division=0))
 
@@ -159,13 +154,14 @@ def train_model():
 
     # Model card
     model_card = classifier.generate_model_card(metrics={
-        'accuracy': float(accuracy_score(y_val, pred_val)),
+        'accuracy': val_accuracy,
         'f1_macro': float(results[0]['f1_macro']),
         'pr_auc_auth': float(results[0]['pr_auc_auth']),
         'recall_at_alpha': float(results[0]['recall_at_alpha']),
         'alpha': float(results[0]['alpha']),
         'train_size': int(len(X_train)),
         'val_size': int(len(X_val)),
+        'train_dtype': str(X_train.dtype),
     })
     card_path = model_dir / 'model_card.json'
     with open(card_path, 'w') as f:
@@ -218,10 +214,11 @@ def train_model():
         },
     ]
 
-    for cookie in test_examples:
-        features = extractor.extract_features(cookie)
-        cookie_type, conf, probs = classifier.predict_from_dict(features, cookie)
-        contributions = classifier.get_feature_contributions(features)
+    # One extraction pass and one model pass for all examples; the loop only formats output
+    X_test = extractor.extract_features_matrix(test_examples, dtype=np.float64)
+    predictions = classifier.predict_from_matrix(X_test, test_examples)
+    for cookie, row, (cookie_type, conf, probs) in zip(test_examples, X_test.tolist(), predictions):
+        contributions = classifier.get_feature_contributions(dict(zip(feature_names, row)))
         print(f"\n  Cookie: {cookie['name']}")
         print(f"    Type: {cookie_type} ({conf:.1%})")
         print(f"    Probs: {probs}")
@@ -5,280 +5,368 @@ Tests all Flask API endpoints with various scenarios
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-from typing import Dict, List, Any
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import functools
+from typing import Dict, List, Any, Optional
 import sys
+import threading
+import time
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is used instead
+    orjson = None
+
+
+def _encode(payload) -> bytes:
+    """Serialize a request body to JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
+
+
+# (connect, read) timeouts in seconds: a dead backend fails in about a second
+# instead of stalling each test for its full read budget
+_TIMEOUT = (1.0, 5.0)
+_BULK_TIMEOUT = (1.0, 15.0)
+
+# Shared read-only defaults for response lookups, so missing keys don't
+# allocate a fresh {} / [] on every .get()
+_EMPTY_DICT = {}
+_EMPTY_LIST = ()
+
+# ANSI colors per log status
+_COLORS = {
+    "PASS": "\033[92m",  # Green
+    "FAIL": "\033[91m",  # Red
+    "INFO": "\033[94m",  # Blue
+    "WARN": "\033[93m",  # Yellow
+    "RESET": "\033[0m"
+}
+
+# Request fixtures, built once at import and shared by every run; the tests
+# only read them
+_BASIC_COOKIES = (
+    {
+        "name": "session_id",
+        "value": "abc123xyz",
+        "domain": "example.com",
+        "path": "/",
+        "secure": False,
+        "httpOnly": False,
+        "sameSite": "none"
+    },
+)
+
+_AUTH_COOKIES = (
+    {
+        "name": "auth_token",
+        "value": "secret_token_12345",
+        "domain": "example.com",
+        "path": "/",
+        "secure": False,  # Insecure!
+        "httpOnly": False,  # Insecure!
+        "sameSite": "none"  # Insecure!
+    },
+    {
+        "name": "session_key",
+        "value": "sess_xyz789",
+        "domain": "example.com",
+        "path": "/",
+        "secure": True,
+        "httpOnly": True,
+        "sameSite": "strict"
+    },
+)
+
+_LOGIN_BEFORE = (
+    {
+        "name": "_ga",
+        "value": "GA1.2.123456",
+        "domain": "example.com",
+        "type": "tracking"
+    },
+)
+
+_LOGIN_AFTER = (
+    {
+        "name": "_ga",
+        "value": "GA1.2.123456",
+        "domain": "example.com",
+        "type": "tracking"
+    },
+    {
+        "name": "session_id",
+        "value": "new_session_xyz",
+        "domain": "example.com",
+        "type": "authentication",
+        "secure": True,
+        "httpOnly": True
+    },
+    {
+        "name": "user_id",
+        "value": "12345",
+        "domain": "example.com",
+        "type": "authentication"
+    },
+)
+
+_LOGOUT_BEFORE = (
+    {
+        "name": "session_id",
+        "value": "active_session",
+        "domain": "example.com",
+        "type": "authentication"
+    },
+    {
+        "name": "user_id",
+        "value": "12345",
+        "domain": "example.com",
+        "type": "authentication"
+    },
+)
+
+
+def _endpoint_test(description: str, failure: str):
+    """
+    Wrap a BackendTester test method: log its start line and turn any
+    exception (connection error, bad JSON, ...) into a FAIL line and False.
+    """
+    def decorator(test_func):
+        @functools.wraps(test_func)
+        def wrapper(self) -> bool:
+            self.log("Testing %s...", description, status="INFO")
+            try:
+                return test_func(self)
+            except Exception as e:
+                self.log("✗ %s - %s", failure, e, status="FAIL")
+                return False
+        return wrapper
+    return decorator
+
 
 class BackendTester:
-    def __init__(self, base_url: str = "http://localhost:5000"):
+    # Encoded body of test_analyze_bulk, filled in on first use
+    _BULK_PAYLOAD: Optional[bytes] = None
+
+    def __init__(self, base_url: str = "http://localhost:5000", quiet: bool = False):
         self.base_url = base_url
+        self.quiet = quiet  # drop INFO lines, keep PASS/FAIL/WARN
         self.results = []
+        # One keep-alive session for the whole suite; connect errors and 5xx
+        # responses are retried with backoff, and once retries run out the last
+        # response is returned so the tests still report its status code. Read
+        # timeouts are not retried: a slow endpoint fails after one timeout.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                read=0,
+                backoff_factor=0.2,
+                status_forcelist=(500, 502, 503, 504),
+                allowed_methods=frozenset(["GET", "POST"]),
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Content-Type": "application/json"})
+        # Tests run on worker threads collect their log lines here so each
+        # test's output can be printed as one block, in suite order
+        self._local = threading.local()
+        # (epoch second, "HH:MM:SS") of the last log line
+        self._last_timestamp = (None, "")
         
-    def log(self, message: str, status: str = "INFO"):
-        """Log test results"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        colors = {
-            "PASS": "\033[92m",  # Green
-            "FAIL": "\033[91m",  # Red
-            "INFO": "\033[94m",  # Blue
-            "WARN": "\033[93m",  # Yellow
-            "RESET": "\033[0m"
-        }
-        color = colors.get(status, colors["INFO"])
-        print(f"[{timestamp}] {color}{status:5}{colors['RESET']} | {message}")
+    def log(self, fmt: str, *args, status: str = "INFO"):
+        """Log test results; fmt is %-formatted with args only if the line is shown"""
+        if self.quiet and status == "INFO":
+            return
+        message = fmt % args if args else fmt
+        color = _COLORS.get(status, _COLORS["INFO"])
+        line = f"[{self._timestamp()}] {color}{status:5}{_COLORS['RESET']} | {message}"
+        lines = getattr(self._local, "lines", None)
+        if lines is None:
+            print(line)
+        else:
+            lines.append(line)
         
+    def _timestamp(self) -> str:
+        """Wall-clock HH:MM:SS, formatted at most once per second"""
+        now = int(time.time())
+        second, text = self._last_timestamp
+        if now != second:
+            text = time.strftime("%H:%M:%S", time.localtime(now))
+            # Swapped in as one tuple so concurrent tests never see a torn pair
+            self._last_timestamp = (now, text)
+        return text
+
+    @_endpoint_test("/health endpoint", "Health check failed")
     def test_health(self) -> bool:
         """Test /health endpoint"""
-        self.log("Testing /health endpoint...", "INFO")
-        try:
-            response = requests.get(f"{self.base_url}/health", timeout=5)
-            data = response.json()
-            
-            if response.status_code == 200 and data.get("status") == "healthy":
-                self.log(f"✓ Health check passed - Model loaded: {data.get('model_loaded')}", "PASS")
-                return True
-            else:
-                self.log(f"✗ Health check failed - Status: {response.status_code}", "FAIL")
-                return False
-        except Exception as e:
-            self.log(f"✗ Health check failed - {str(e)}", "FAIL")
+        response = self.session.get(f"{self.base_url}/health", timeout=_TIMEOUT)
+        data = response.json()
+        
+        if response.status_code == 200 and data.get("status") == "healthy":
+            self.log("✓ Health check passed - Model loaded: %s", data.get('model_loaded'), status="PASS")
+            return True
+        else:
+            self.log("✗ Health check failed - Status: %s", response.status_code, status="FAIL")
             return False
     
+    @_endpoint_test("/api/demo endpoint", "Demo endpoint failed")
     def test_demo(self) -> bool:
         """Test /api/demo endpoint"""
-        self.log("Testing /api/demo endpoint...", "INFO")
-        try:
-            response = requests.get(f"{self.base_url}/api/demo", timeout=5)
-            data = response.json()
-            
-            if response.status_code == 200 and "cookies" in data:
-                cookie_count = len(data["cookies"])
-                self.log(f"✓ Demo endpoint working - {cookie_count} cookies returned", "PASS")
-                return True
-            else:
-                self.log(f"✗ Demo endpoint failed - Status: {response.status_code}", "FAIL")
-                return False
-        except Exception as e:
-            self.log(f"✗ Demo endpoint failed - {str(e)}", "FAIL")
+        response = self.session.get(f"{self.base_url}/api/demo", timeout=_TIMEOUT)
+        data = response.json()
+        
+        if response.status_code == 200 and "cookies" in data:
+            cookie_count = len(data["cookies"])
+            self.log("✓ Demo endpoint working - %s cookies returned", cookie_count, status="PASS")
+            return True
+        else:
+            self.log("✗ Demo endpoint failed - Status: %s", response.status_code, status="FAIL")
             return False
     
+    @_endpoint_test("/api/analyze with basic cookies", "Analysis failed")
     def test_analyze_basic(self) -> bool:
         """Test /api/analyze with basic cookies"""
-        self.log("Testing /api/analyze with basic cookies...", "INFO")
+        test_cookies = _BASIC_COOKIES
         
-        test_cookies = [
-            {
-                "name": "session_id",
-                "value": "abc123xyz",
-                "domain": "example.com",
-                "path": "/",
-                "secure": False,
-                "httpOnly": False,
-                "sameSite": "none"
-            }
-        ]
+        response = self.session.post(
+            f"{self.base_url}/api/analyze",
+            data=_encode({"cookies": test_cookies}),
+            timeout=_TIMEOUT
+        )
+        data = response.json()
         
-        try:
-            response = requests.post(
-                f"{self.base_url}/api/analyze",
-                json={"cookies": test_cookies},
-                headers={"Content-Type": "application/json"},
-                timeout=10
-            )
-            data = response.json()
-            
-            if response.status_code == 200 and "results" in data:
-                result_count = len(data["results"])
-                summary = data.get("summary_stats", {})
-                self.log(f"✓ Analysis passed - {result_count} results, {summary.get('critical', 0)} critical issues", "PASS")
-                return True
-            else:
-                self.log(f"✗ Analysis failed - Status: {response.status_code}", "FAIL")
-                return False
-        except Exception as e:
-            self.log(f"✗ Analysis failed - {str(e)}", "FAIL")
+        if response.status_code == 200 and "results" in data:
+            result_count = len(data["results"])
+            summary = data.get("summary_stats", _EMPTY_DICT)
+            self.log("✓ Analysis passed - %s results, %s critical issues", result_count, summary.get('critical', 0), status="PASS")
+            return True
+        else:
+            self.log("✗ Analysis failed - Status: %s", response.status_code, status="FAIL")
             return False
     
+    @_endpoint_test("/api/analyze with insecure auth cookies", "Analysis failed")
     def test_analyze_auth_cookies(self) -> bool:
         """Test /api/analyze with authentication cookies"""
-        self.log("Testing /api/analyze with insecure auth cookies...", "INFO")
+        test_cookies = _AUTH_COOKIES
         
-        test_cookies = [
-            {
-                "name": "auth_token",
-                "value": "secret_token_12345",
-                "domain": "example.com",
-                "path": "/",
-                "secure": False,  # Insecure!
-                "httpOnly": False,  # Insecure!
-                "sameSite": "none"  # Insecure!
-            },
-            {
-                "name": "session_key",
-                "value": "sess_xyz789",
-                "domain": "example.com",
-                "path": "/",
-                "secure": True,
-                "httpOnly": True,
-                "sameSite": "strict"
-            }
-        ]
+        response = self.session.post(
+            f"{self.base_url}/api/analyze",
+            data=_encode({"cookies": test_cookies}),
+            timeout=_TIMEOUT
+        )
+        data = response.json()
         
-        try:
-            response = requests.post(
-                f"{self.base_url}/api/analyze",
-                json={"cookies": test_cookies},
-                headers={"Content-Type": "application/json"},
-                timeout=10
-            )
-            data = response.json()
+        if response.status_code == 200:
+            summary = data.get("summary_stats", _EMPTY_DICT)
+            critical = summary.get("critical", 0)
             
-            if response.status_code == 200:
-                summary = data.get("summary_stats", {})
-                critical = summary.get("critical", 0)
-                
-                if critical > 0:
-                    self.log(f"✓ Correctly detected {critical} critical issues in insecure auth cookie", "PASS")
-                    return True
-                else:
-                    self.log("✗ Failed to detect critical issues in insecure auth cookie", "FAIL")
-                    return False
+            if critical > 0:
+                self.log("✓ Correctly detected %s critical issues in insecure auth cookie", critical, status="PASS")
+                return True
             else:
-                self.log(f"✗ Analysis failed - Status: {response.status_code}", "FAIL")
+                self.log("✗ Failed to detect critical issues in insecure auth cookie", status="FAIL")
                 return False
-        except Exception as e:
-            self.log(f"✗ Analysis failed - {str(e)}", "FAIL")
+        else:
+            self.log("✗ Analysis failed - Status: %s", response.status_code, status="FAIL")
             return False
     
+    @_endpoint_test("/api/analyze-login with login scenario", "Login analysis failed")
     def test_analyze_login_basic(self) -> bool:
         """Test /api/analyze-login with basic scenario"""
-        self.log("Testing /api/analyze-login with login scenario...", "INFO")
-        
-        before_cookies = [
-            {
-                "name": "_ga",
-                "value": "GA1.2.123456",
-                "domain": "example.com",
-                "type": "tracking"
-            }
-        ]
+        before_cookies = _LOGIN_BEFORE
+        after_cookies = _LOGIN_AFTER
         
-        after_cookies = [
-            {
-                "name": "_ga",
-                "value": "GA1.2.123456",
-                "domain": "example.com",
-                "type": "tracking"
-            },
-            {
-                "name": "session_id",
-                "value": "new_session_xyz",
-                "domain": "example.com",
-                "type": "authentication",
-                "secure": True,
-                "httpOnly": True
-            },
-            {
-                "name": "user_id",
-                "value": "12345",
-                "domain": "example.com",
-                "type": "authentication"
-            }
-        ]
+        response = self.session.post(
+            f"{self.base_url}/api/analyze-login",
+            data=_encode({"before": before_cookies, "after": after_cookies}),
+            timeout=_TIMEOUT
+        )
+        data = response.json()
         
-        try:
-            response = requests.post(
-                f"{self.base_url}/api/analyze-login",
-                json={"before": before_cookies, "after": after_cookies},
-                headers={"Content-Type": "application/json"},
-                timeout=10
-            )
-            data = response.json()
+        if response.status_code == 200:
+            login_detected = data.get("login_detected", False)
+            added = len(data.get("changes", _EMPTY_DICT).get("added", _EMPTY_LIST))
             
-            if response.status_code == 200:
-                login_detected = data.get("login_detected", False)
-                added = len(data.get("changes", {}).get("added", []))
-                
-                if login_detected and added > 0:
-                    self.log(f"✓ Correctly detected login - {added} new cookies", "PASS")
-                    return True
-                else:
-                    self.log(f"✗ Failed to detect login event", "FAIL")
-                    return False
+            if login_detected and added > 0:
+                self.log("✓ Correctly detected login - %s new cookies", added, status="PASS")
+                return True
             else:
-                self.log(f"✗ Login analysis failed - Status: {response.status_code}", "FAIL")
+                self.log("✗ Failed to detect login event", status="FAIL")
                 return False
-        except Exception as e:
-            self.log(f"✗ Login analysis failed - {str(e)}", "FAIL")
+        else:
+            self.log("✗ Login analysis failed - Status: %s", response.status_code, status="FAIL")
             return False
     
+    @_endpoint_test("/api/analyze-login with logout scenario", "Logout analysis failed")
     def test_analyze_logout(self) -> bool:
         """Test /api/analyze-login with logout scenario"""
-        self.log("Testing /api/analyze-login with logout scenario...", "INFO")
+        before_cookies = _LOGOUT_BEFORE
+        after_cookies = ()  # Session cookies removed after logout
         
-        before_cookies = [
-            {
-                "name": "session_id",
-                "value": "active_session",
-                "domain": "example.com",
-                "type": "authentication"
-            },
-            {
-                "name": "user_id",
-                "value": "12345",
-                "domain": "example.com",
-                "type": "authentication"
-            }
-        ]
-        
-        after_cookies = [
-            # Session cookies removed after logout
-        ]
+        response = self.session.post(
+            f"{self.base_url}/api/analyze-login",
+            data=_encode({"before": before_cookies, "after": after_cookies}),
+            timeout=_TIMEOUT
+        )
+        data = response.json()
         
-        try:
-            response = requests.post(
-                f"{self.base_url}/api/analyze-login",
-                json={"before": before_cookies, "after": after_cookies},
-                headers={"Content-Type": "application/json"},
-                timeout=10
-            )
-            data = response.json()
+        if response.status_code == 200:
+            removed = len(data.get("changes", _EMPTY_DICT).get("removed", _EMPTY_LIST))
             
-            if response.status_code == 200:
-                removed = len(data.get("changes", {}).get("removed", []))
-                
-                if removed > 0:
-                    self.log(f"✓ Correctly detected logout - {removed} cookies removed", "PASS")
-                    return True
-                else:
-                    self.log("✗ Failed to detect logout event", "FAIL")
-                    return False
+            if removed > 0:
+                self.log("✓ Correctly detected logout - %s cookies removed", removed, status="PASS")
+                return True
             else:
-                self.log(f"✗ Logout analysis failed - Status: {response.status_code}", "FAIL")
+                self.log("✗ Failed to detect logout event", status="FAIL")
                 return False
-        except Exception as e:
-            self.log(f"✗ Logout analysis failed - {str(e)}", "FAIL")
+        else:
+            self.log("✗ Logout analysis failed - Status: %s", response.status_code, status="FAIL")
             return False
     
+    @_endpoint_test("/api/analyze with bulk cookies", "Bulk analysis failed")
     def test_analyze_bulk(self) -> bool:
         """Test /api/analyze with many cookies"""
-        self.log("Testing /api/analyze with bulk cookies...", "INFO")
+        # Built and encoded on first use, then shared by every later run
+        if BackendTester._BULK_PAYLOAD is None:
+            BackendTester._BULK_PAYLOAD = _encode({"cookies": self._build_bulk_cookies()})
         
-        # Generate 50 test cookies
-        test_cookies = []
+        response = self.session.post(
+            f"{self.base_url}/api/analyze",
+            data=BackendTester._BULK_PAYLOAD,
+            timeout=_BULK_TIMEOUT
+        )
+        data = response.json()
+        
+        if response.status_code == 200 and len(data.get("results", _EMPTY_LIST)) == 50:
+            self.log("✓ Bulk analysis passed - %s cookies analyzed", len(data['results']), status="PASS")
+            return True
+        else:
+            self.log("✗ Bulk analysis failed - Expected 50 results, got %s", len(data.get('results', _EMPTY_LIST)), status="FAIL")
+            return False
+    
+    @staticmethod
+    def _build_bulk_cookies() -> List[Dict[str, Any]]:
+        """Generate the 50 mixed-type cookies posted by test_analyze_bulk"""
         cookie_types = ["tracking", "functional", "authentication"]
         cookie_names = {
             "tracking": ["_ga", "_gid", "__utma", "__utmz", "analytics_id"],
             "functional": ["preferences", "language", "theme", "currency"],
             "authentication": ["session", "token", "auth", "user_id", "csrf"]
         }
+        # (index, type, name list) per cookie, resolved once up front
+        plan = [(i, cookie_types[i % 3], cookie_names[cookie_types[i % 3]]) for i in range(50)]
         
-        for i in range(50):
-            cookie_type = cookie_types[i % 3]
-            name_list = cookie_names[cookie_type]
-            
-            test_cookies.append({
+        return [
+            {
                 "name": f"{name_list[i % len(name_list)]}_{i}",
                 "value": f"value_{i}",
                 "domain": "example.com",
@@ -286,69 +374,64 @@ class BackendTester:
                 "secure": i % 2 == 0,
                 "httpOnly": cookie_type == "authentication" and i % 2 == 0,
                 "sameSite": "lax" if i % 3 == 0 else "none"
-            })
-        
-        try:
-            response = requests.post(
-                f"{self.base_url}/api/analyze",
-                json={"cookies": test_cookies},
-                headers={"Content-Type": "application/json"},
-                timeout=30
-            )
-            data = response.json()
-            
-            if response.status_code == 200 and len(data.get("results", [])) == 50:
-                self.log(f"✓ Bulk analysis passed - {len(data['results'])} cookies analyzed", "PASS")
-                return True
-            else:
-                self.log(f"✗ Bulk analysis failed - Expected 50 results, got {len(data.get('results', []))}", "FAIL")
-                return False
-        except Exception as e:
-            self.log(f"✗ Bulk analysis failed - {str(e)}", "FAIL")
-            return False
+            }
+            for i, cookie_type, name_list in plan
+        ]
     
+    @_endpoint_test("error handling", "Error handling failed")
     def test_error_handling(self) -> bool:
         """Test error handling with invalid input"""
-        self.log("Testing error handling...", "INFO")
-        
         tests = [
             ("Empty cookie list", {"cookies": []}),
             ("Missing cookies key", {}),
             ("Invalid cookie format", {"cookies": [{"invalid": "data"}]}),
         ]
         
-        passed = 0
-        for test_name, payload in tests:
-            try:
-                response = requests.post(
+        # The three probes are independent, so they go out together; results
+        # are still checked (and logged from this thread) in the order above
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            futures = [
+                (test_name, executor.submit(
+                    self.session.post,
                     f"{self.base_url}/api/analyze",
-                    json=payload,
-                    headers={"Content-Type": "application/json"},
-                    timeout=5
-                )
-                
-                # Should either succeed with empty results or return proper error
-                if response.status_code in [200, 400]:
-                    passed += 1
-                    self.log(f"  ✓ {test_name}: Handled correctly", "PASS")
-                else:
-                    self.log(f"  ✗ {test_name}: Unexpected status {response.status_code}", "FAIL")
-            except Exception as e:
-                self.log(f"  ✗ {test_name}: {str(e)}", "FAIL")
+                    data=_encode(payload),
+                    timeout=_TIMEOUT
+                ))
+                for test_name, payload in tests
+            ]
+            
+            passed = 0
+            for test_name, future in futures:
+                try:
+                    response = future.result()
+                    
+                    # Should either succeed with empty results or return proper error
+                    if response.status_code in [200, 400]:
+                        passed += 1
+                        self.log("  ✓ %s: Handled correctly", test_name, status="PASS")
+                    else:
+                        self.log("  ✗ %s: Unexpected status %s", test_name, response.status_code, status="FAIL")
+                except Exception as e:
+                    self.log("  ✗ %s: %s", test_name, e, status="FAIL")
         
         if passed == len(tests):
-            self.log(f"✓ Error handling passed - {passed}/{len(tests)} tests", "PASS")
+            self.log("✓ Error handling passed - %s/%s tests", passed, len(tests), status="PASS")
             return True
         else:
-            self.log(f"✗ Error handling failed - {passed}/{len(tests)} tests passed", "FAIL")
+            self.log("✗ Error handling failed - %s/%s tests passed", passed, len(tests), status="FAIL")
             return False
     
-    def run_all_tests(self):
-        """Run all tests and generate report"""
-        self.log("=" * 60, "INFO")
-        self.log("CookieGuard Backend Test Suite", "INFO")
-        self.log(f"Testing: {self.base_url}", "INFO")
-        self.log("=" * 60, "INFO")
+    def run_all_tests(self, fail_fast: bool = True):
+        """Run all tests and generate report
+
+        With fail_fast, a backend that does not answer a quick /health probe
+        fails the whole suite up front instead of letting every test wait
+        out its own connection attempts.
+        """
+        self.log("=" * 60, status="INFO")
+        self.log("CookieGuard Backend Test Suite", status="INFO")
+        self.log("Testing: %s", self.base_url, status="INFO")
+        self.log("=" * 60, status="INFO")
         
         tests = [
             ("Health Check", self.test_health),
@@ -361,42 +444,76 @@ class BackendTester:
             ("Error Handling", self.test_error_handling),
         ]
         
+        # The endpoints are independent, so the tests run concurrently; their
+        # output is still printed test by test in the order listed above
         results = []
-        for test_name, test_func in tests:
-            self.log("", "INFO")
-            self.log(f"Running: {test_name}", "INFO")
-            self.log("-" * 60, "INFO")
-            try:
-                passed = test_func()
+        if fail_fast and not self._backend_reachable():
+            self.log("", status="INFO")
+            self.log("Backend unreachable at %s - skipping %s tests", self.base_url, len(tests), status="WARN")
+            results = [(test_name, False) for test_name, _ in tests]
+            tests = []
+        with ThreadPoolExecutor(max_workers=max(len(tests), 1)) as executor:
+            futures = [executor.submit(self._run_test, test_name, test_func)
+                       for test_name, test_func in tests]
+            for (test_name, _), future in zip(tests, futures):
+                passed, lines = future.result()
+                # One write per test block, flushed so progress still shows live
+                sys.stdout.write("".join(f"{line}\n" for line in lines))
+                sys.stdout.flush()
                 results.append((test_name, passed))
-            except Exception as e:
-                self.log(f"Test crashed: {str(e)}", "FAIL")
-                results.append((test_name, False))
         
         # Summary
-        self.log("", "INFO")
-        self.log("=" * 60, "INFO")
-        self.log("Test Summary", "INFO")
-        self.log("=" * 60, "INFO")
+        self.log("", status="INFO")
+        self.log("=" * 60, status="INFO")
+        self.log("Test Summary", status="INFO")
+        self.log("=" * 60, status="INFO")
         
         passed_count = sum(1 for _, passed in results if passed)
         total_count = len(results)
         
         for test_name, passed in results:
             status = "PASS" if passed else "FAIL"
-            self.log(f"{test_name:30} : {'✓' if passed else '✗'}", status)
+            self.log("%-30s : %s", test_name, '✓' if passed else '✗', status=status)
         
-        self.log("", "INFO")
-        self.log(f"Results: {passed_count}/{total_count} tests passed", 
-                "PASS" if passed_count == total_count else "WARN")
+        self.log("", status="INFO")
+        self.log("Results: %s/%s tests passed", passed_count, total_count,
+                 status="PASS" if passed_count == total_count else "WARN")
         
         if passed_count == total_count:
-            self.log("🎉 All tests passed!", "PASS")
+            self.log("🎉 All tests passed!", status="PASS")
             return 0
         else:
-            self.log(f"⚠️  {total_count - passed_count} test(s) failed", "WARN")
+            self.log("⚠️  %s test(s) failed", total_count - passed_count, status="WARN")
             return 1
 
+    def _backend_reachable(self) -> bool:
+        """One short, unretried /health request; False if no connection can be made"""
+        try:
+            requests.get(f"{self.base_url}/health", timeout=0.5)
+        except requests.ConnectionError:
+            # Refused connection or ConnectTimeout: nothing is listening
+            return False
+        except requests.RequestException:
+            # Connected but slow or malformed; the tests themselves report that
+            pass
+        return True
+
+    def _run_test(self, test_name: str, test_func) -> tuple:
+        """Run one test on the current thread, returning (passed, buffered log lines)"""
+        self._local.lines = lines = []
+        try:
+            self.log("", status="INFO")
+            self.log("Running: %s", test_name, status="INFO")
+            self.log("-" * 60, status="INFO")
+            try:
+                passed = test_func()
+            except Exception as e:
+                self.log("Test crashed: %s", e, status="FAIL")
+                passed = False
+        finally:
+            self._local.lines = None
+        return passed, lines
+
 def main():
     """Main entry point"""
     import argparse
@@ -413,13 +530,24 @@ def main():
         default="all",
         help="Specific test to run (default: all)"
     )
+    parser.add_argument(
+        "--fail-fast",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Skip the suite when the backend is unreachable (default: on)"
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Only print PASS/FAIL/WARN lines"
+    )
     
     args = parser.parse_args()
     
-    tester = BackendTester(args.url)
+    tester = BackendTester(args.url, quiet=args.quiet)
     
     if args.test == "all":
-        return tester.run_all_tests()
+        return tester.run_all_tests(fail_fast=args.fail_fast)
     elif args.test == "health":
         return 0 if tester.test_health() else 1
     elif args.test == "demo":
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Parity tests for CookieFeatureExtractor.extract_features_parallel
+
+Sharding cookies across worker processes must not change any feature value
+or the row order of the matrix.
+
+Run with:  python test/test_feature_extractor.py
+"""
+
+import json
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / 'backend'))
+
+from feature_extractor import CookieFeatureExtractor
+
+CONTEXT = {'loginEvent': True, 'changedCookies': ['sessionid'], 'currentDomain': 'github.com'}
+
+
+class ExtractFeaturesParallelTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cookies = (json.loads((ROOT / 'data' / 'training_cookies.json').read_text())
+                       + json.loads((ROOT / 'data' / 'test_cookies.json').read_text()))
+
+    def setUp(self):
+        self.extractor = CookieFeatureExtractor()
+        # Fan out even for the small bundled dataset
+        self.extractor.PARALLEL_MIN_COOKIES = 0
+
+    def test_parallel_matches_serial(self):
+        for context in (None, CONTEXT):
+            with self.subTest(context=context):
+                expected = self.extractor.extract_features_matrix(self.cookies, context)
+                actual = self.extractor.extract_features_parallel(self.cookies, context, workers=3)
+                self.assertEqual(actual.dtype, expected.dtype)
+                np.testing.assert_array_equal(actual, expected)
+
+    def test_small_batch_stays_in_process(self):
+        """Below PARALLEL_MIN_COOKIES (or with one worker) no pool is started"""
+        self.extractor.PARALLEL_MIN_COOKIES = len(self.cookies) + 1
+        np.testing.assert_array_equal(
+            self.extractor.extract_features_parallel(self.cookies, workers=3),
+            self.extractor.extract_features_matrix(self.cookies),
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Parity tests for RiskScorer.analyze_cookies
+
+The batch path re-implements the scalar scoring rules twice (a numba kernel
+and a NumPy fallback); both must agree with analyze_cookie row for row.
+
+Run with:  python test/test_risk_scorer.py
+"""
+
+import json
+import random
+import sys
+import time
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / 'backend'))
+
+import risk_scorer
+from risk_scorer import RiskScorer
+
+# Hand-written cookies covering every branch of the scope precedence chain
+EDGE_COOKIES = [
+    {'name': '__Host-SESSION', 'value': 'x', 'domain': 'a.com', 'hostOnly': False},
+    {'name': '__host-sid', 'value': 'x', 'domain': 'a.com'},
+    {'name': '__Secure-auth', 'value': 'ab==', 'domain': '.a.com', 'secure': 'true', 'httpOnly': '1', 'sameSite': 'Lax'},
+    {'name': 'Shared_Global', 'value': 'v', 'domain': 'a.com', 'hostOnly': False, 'expirationDate': '2030-01-01T00:00:00'},
+    {'name': 'global_pref', 'value': 'v', 'domain': '', 'path': '/'},
+    {'name': 'jwt', 'value': 'a.b.c', 'domain': 'x.a.com', 'sameSite': 'no_restriction', 'hostOnly': False},
+    {'name': 'sessionid', 'value': 'v', 'domain': 'localhost', 'hostOnly': False},
+    {'name': 'sid', 'value': 'v', 'domain': 'a.com', 'hostOnly': False, 'expirationDate': 4102444800},
+    {'name': 'token', 'value': 'v', 'path': '/app', 'HttpOnly': 'yes', 'Secure': 'on', 'sameSite': 'STRICT'},
+    {'name': 'x', 'value': 'v', 'expirationDate': 1.0},
+]
+SITE_HOSTS = (None, 'a.com', 'x.a.com')
+ML_TYPES = ('authentication', 'tracking', 'preference', 'other')
+
+
+def _load_cookies():
+    cookies = json.loads((ROOT / 'data' / 'test_cookies.json').read_text())
+    for path in sorted((ROOT / 'test').glob('sample-*.json')):
+        data = json.loads(path.read_text())
+        cookies.extend(data.get('cookies', []) if isinstance(data, dict) else data)
+    return cookies + EDGE_COOKIES
+
+
+class AnalyzeCookiesParityTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.scorer = RiskScorer()
+        cls.cookies = _load_cookies()
+        rng = random.Random(0)
+        n = len(cls.cookies)
+        cls.ml_types = [rng.choice(ML_TYPES) for _ in range(n)]
+        cls.confidences = [rng.random() for _ in range(n)]
+        cls.probabilities = [{'authentication': rng.random(), 'tracking': rng.random()} for _ in range(n)]
+
+    def _assert_parity(self, now=None):
+        for site_host in SITE_HOSTS:
+            with self.subTest(site_host=site_host, now=now):
+                # Both paths share one reference time so lifetimes cannot straddle a day boundary
+                ref = time.time() if now is None else now
+                expected = [
+                    self.scorer.analyze_cookie(c, t, conf, p, site_host=site_host, now=ref)
+                    for c, t, conf, p in zip(self.cookies, self.ml_types, self.confidences, self.probabilities)
+                ]
+                actual = self.scorer.analyze_cookies(
+                    self.cookies, self.ml_types, self.confidences, self.probabilities,
+                    site_host=site_host, now=ref
+                )
+                self.assertEqual(actual, expected)
+
+    def test_batch_matches_scalar(self):
+        """Default path: the numba kernel when numba is installed"""
+        self._assert_parity()
+
+    def test_numpy_fallback_matches_scalar(self):
+        """Force the NumPy mask path used when numba is missing"""
+        saved = risk_scorer._score_kernel
+        risk_scorer._score_kernel = False
+        try:
+            self._assert_parity()
+        finally:
+            risk_scorer._score_kernel = saved
+
+    def test_explicit_now_matches_scalar(self):
+        """A caller-supplied reference time reaches the lifetime checks of both paths"""
+        for now in (0.0, 1767225600.0, 4102444800.0):
+            self._assert_parity(now)
+
+    def test_now_changes_lifetime_result(self):
+        """400 days out is a long-lived session; one day out is not"""
+        start = 1767225600.0
+        cookie = {'name': 'sid', 'value': 'v', 'domain': 'a.com', 'expirationDate': start + 400 * 86400}
+        args = ([cookie], ['authentication'], [0.9], [{'authentication': 0.9}])
+        early = self.scorer.analyze_cookies(*args, now=start)[0]
+        late = self.scorer.analyze_cookies(*args, now=start + 399 * 86400)[0]
+        self.assertNotEqual(early, late)
+
+    def test_uses_auth_rows(self):
+        """Sanity check that the fixtures actually exercise the scored path"""
+        results = self.scorer.analyze_cookies(
+            self.cookies, ['authentication'] * len(self.cookies),
+            self.confidences, self.probabilities, site_host='a.com'
+        )
+        self.assertTrue(any(r['risk_assessment']['score'] > 0 for r in results))
+
+
+if __name__ == '__main__':
+    unittest.main()